@@ -1,7 +1,24 @@
 # -*- coding: utf-8 -*-
 
-__version__ = "1.0.0"
+from conplex._lazy import lazy_exports
 
-from .conplex import run
-from conplex.core.project_manager import ProjectManager
-__all__ = ['run', 'ProjectManager']
+__version__ = "1.0.1"
+
+# The public names are imported on first access, so that importing conplex
+# stays cheap and does not open the project registry
+_exports = {
+    'run': 'conplex.conplex',
+    'reload': 'conplex.core.reloader',
+    'on_reload': 'conplex.core.reloader',
+    'remove_reload_callback': 'conplex.core.reloader',
+    'ProjectManager': 'conplex.core.project_manager',
+    'AsyncConverter': 'conplex.core.async_converter',
+    'convert_async': 'conplex.core.async_converter',
+    'ConPlexError': 'conplex.core.errors',
+    'ConversionError': 'conplex.core.errors',
+    'load_module': 'conplex.api.api',
+    'generate_sources': 'conplex.api.api'
+}
+__all__ = list(_exports)
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+Lazy exports for the ConPlex packages. A package lists the module each
+public name is defined in, and the name is only imported on first access,
+so that importing a package stays cheap and free of side effects.
+"""
+
+from importlib import import_module
+import sys
+
+
+def lazy_exports(package_name, exports):
+
+    """
+    Returns the module level __getattr__ and __dir__ functions of a package
+    that imports its public names on first access. An imported name is
+    stored in the package, so later accesses do not go through __getattr__
+
+    args:
+        package_name: (string) The name of the package, i.e. its __name__
+        exports: (dict) Maps each public name to the full name of the module it is defined in
+    """
+
+    def __getattr__(name):
+        try:
+            module_name = exports[name]
+        except KeyError:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(package_name, name)) from None
+        value = getattr(import_module(module_name), name)
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package_name])) | set(exports))
+
+    return __getattr__, __dir__
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+from conplex._lazy import lazy_exports
+
+_exports = {
+    'load_module': 'conplex.api.api',
+    'generate_sources': 'conplex.api.api'
+}
+__all__ = list(_exports)
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
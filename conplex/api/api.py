@@ -1,2 +1,99 @@
 # -*- coding: utf-8 -*-
 
+"""
+Converts YAML into a module object entirely in memory. The YAML is parsed
+and emitted exactly as for a module written to disk, and the generated
+sources are compiled and executed straight away, so the module has the same
+classes and variables as its on-disk counterpart without any file being
+written or read back.
+"""
+
+from importlib.machinery import ModuleSpec
+from importlib.util import module_from_spec
+from os import path, getcwd
+
+from conplex.core.yaml_converter import YAMLConverter
+from conplex.core.reloader import execute_package
+
+
+def _read_source(source):
+
+    """
+    Returns the raw bytes of YAML given as a string, a bytes-like object or
+    a stream
+    """
+
+    if hasattr(source, 'read'):
+        source = source.read()
+    if isinstance(source, str):
+        return source.encode('utf-8')
+    return bytes(source)
+
+
+def generate_sources(source, module_name='config', base_dir=None, **options):
+
+    """
+    Converts YAML in memory and returns the files of the generated module, as
+    a dict mapping each file name to its content. Sources are strings and the
+    array file is bytes. A YAMLParseError is raised if the YAML is not a
+    mapping with at least one key
+
+    args:
+        source: The YAML, as a string, a bytes-like object or a binary or text stream
+        module_name: (string) The name of the generated module
+        base_dir: (string) The directory relative includes are resolved against. Defaults to the working directory
+        options: Additional YAMLConverter arguments that shape the module, e.g. case_correction, deduplicate, flatten or arrays
+    """
+
+    yaml_path = path.join(base_dir or getcwd(), module_name + '.yaml')
+    converter = YAMLConverter(yaml_path,
+                              module_name=module_name,
+                              silent=True,
+                              raise_errors=True,
+                              source=_read_source(source),
+                              **options)
+    return converter.generate()
+
+
+def load_module(source, module_name='config', base_dir=None, **options):
+
+    """
+    Converts YAML in memory and returns the generated module, ready to use.
+    The module is not added to sys.modules. Errors are raised as
+    ConversionError subclasses, see conplex.core.errors
+
+    args:
+        source: The YAML, as a string, a bytes-like object or a binary or text stream
+        module_name: (string) The name of the module
+        base_dir: (string) The directory relative includes are resolved against. Defaults to the working directory
+        options: Additional YAMLConverter arguments that shape the module, e.g. case_correction, deduplicate, flatten or arrays.
+        The submodules of a split module are imported through sys.modules, so split is not supported
+    """
+
+    if options.get('split'):
+        raise ValueError('Split modules can not be loaded in memory')
+    files = generate_sources(source, module_name=module_name, base_dir=base_dir, **options)
+
+    staged = {}  # Maps each full module name to its module, code and whether it has been executed, see execute_package
+    for file_name, content in files.items():
+        name, extension = path.splitext(file_name)
+        if extension != '.py':
+            continue
+        full_name = module_name if name == '__init__' else '{}.{}'.format(module_name, name)
+        spec = ModuleSpec(full_name, None, is_package=name == '__init__')
+        code = compile(content, path.join(module_name, file_name), 'exec', dont_inherit=True)
+        staged[full_name] = [module_from_spec(spec), code, False]
+
+    arrays_name = module_name + '._arrays'
+    if arrays_name in staged:
+        # The stored lists are views of the emitted bytes rather than of a memory mapped file
+        arrays_module = staged[arrays_name][0]
+        exec(staged[arrays_name][1], arrays_module.__dict__)
+        arrays_module._buffer = memoryview(files['_arrays.bin'])
+        staged[arrays_name][2] = True
+
+    return execute_package(module_name, staged)[module_name]
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks for the ConPlex conversion pipeline. Each module in this package
+can be run directly, e.g. python -m conplex.bench.emitter
+"""
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares the cost of reading a deeply nested setting through the nested
+classes of a generated module with reading its flattened constant.
+"""
+
+from os import path
+from tempfile import TemporaryDirectory
+from importlib import import_module
+import timeit
+import sys
+
+from conplex.core import YAMLConverter
+
+ACCESS_YAML = '''
+Page size:
+  Page name:
+    nested class:
+      another nested class:
+        attr: 100
+'''
+
+NESTED = 'Page_size.Page_name.nested_class.another_nested_class.attr'
+FLAT = 'PAGE_SIZE__PAGE_NAME__NESTED_CLASS__ANOTHER_NESTED_CLASS__ATTR'
+
+
+def benchmark_access(number=1000000, repeat=5):
+
+    """
+    Generates a nested configuration with the flatten option and returns a
+    list of result dicts with the time of a single read in each layout
+
+    args:
+        number: The number of reads per timing run
+        repeat: The number of timing runs. The fastest one is reported
+    """
+
+    results = []
+    with TemporaryDirectory() as temp_dir:
+        yaml_path = path.join(temp_dir, 'access.yaml')
+        with open(yaml_path, 'w') as yaml_file:
+            yaml_file.write(ACCESS_YAML)
+        YAMLConverter(yaml_path, output_dir=temp_dir + '/', module_name='bench_access', silent=True, flatten=True)()
+
+        sys.path.insert(0, temp_dir)
+        try:
+            module = import_module('bench_access')
+            statements = {
+                'nested classes': 'module.' + NESTED,
+                'flat constant': 'module.' + FLAT,
+                'imported constant': FLAT
+            }
+            namespace = {'module': module, FLAT: getattr(module, FLAT)}
+            for layout, statement in statements.items():
+                best = min(timeit.repeat(statement, globals=namespace, number=number, repeat=repeat))
+                results.append({'layout': layout, 'statement': statement, 'nanoseconds_per_read': best / number * 1e9})
+        finally:
+            sys.path.remove(temp_dir)
+            sys.modules.pop('bench_access', None)
+            sys.modules.pop('bench_access.config', None)
+    return results
+
+
+def main():
+
+    print('{:>18} {:>10}'.format('layout', 'ns/read'))
+    for result in benchmark_access():
+        print('{:>18} {:>10.1f}'.format(result['layout'], result['nanoseconds_per_read']))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares emitting long numeric lists as list literals with storing them in
+the array sidecar file, as read-only memoryviews or as array.array copies.
+For each layout, reports the conversion time, the size of the generated
+files, and the time and resident memory growth of a fresh interpreter
+importing the module and then reading every list.
+"""
+
+from os import path, listdir
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import subprocess
+import sys
+
+from conplex.bench.generators import large_lists
+from conplex.core import YAMLConverter
+
+LAYOUTS = {
+    'list literals': {},
+    'memoryview': {'arrays': 256, 'array_type': 'memoryview'},
+    'array.array': {'arrays': 256, 'array_type': 'array'}
+}
+
+RSS_SCRIPT = '''
+import sys, time, resource
+sys.path.insert(0, {directory!r})
+
+def rss():
+    # The current resident set size in KiB. The peak size is used where /proc is not available
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize() // 1024
+    except IOError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+before = rss()
+start = time.perf_counter()
+import {package}
+import_seconds = time.perf_counter() - start
+import_rss = rss()
+start = time.perf_counter()
+series = {package}.series
+total = sum(sum(getattr(series, name)) for name in list(vars(series)) if not name.startswith('__'))
+access_seconds = time.perf_counter() - start
+print(import_seconds, access_seconds, import_rss - before, rss() - before)
+'''
+
+
+def measure_layout(layout, num_values, directory, repeat=3):
+
+    """
+    Converts a configuration of long lists in one layout and returns a result dict
+
+    args:
+        layout: The name of a layout in LAYOUTS
+        num_values: The total number of list elements in the configuration
+        directory: A scratch directory for the YAML file and the generated module
+        repeat: The number of timed runs. The fastest one is reported
+    """
+
+    package = 'arrays_{}_{}'.format(layout.replace(' ', '_').replace('.', '_'), num_values)
+    yaml_path = path.join(directory, package + '.yaml')
+    with open(yaml_path, 'w') as yaml_file:
+        yaml_file.write(large_lists(num_values))
+
+    convert_seconds = None
+    for _ in range(repeat):
+        start = perf_counter()
+        YAMLConverter(yaml_path, output_dir=directory + '/', silent=True, **LAYOUTS[layout])()
+        elapsed = perf_counter() - start
+        convert_seconds = elapsed if convert_seconds is None else min(convert_seconds, elapsed)
+
+    package_dir = path.join(directory, package)
+    script = RSS_SCRIPT.format(directory=directory, package=package)
+    subprocess.check_output([sys.executable, '-c', script])  # Warm up the bytecode cache
+    runs = [subprocess.check_output([sys.executable, '-c', script]).split() for _ in range(repeat)]
+    import_seconds, access_seconds, import_rss, access_rss = min(runs, key=lambda run: float(run[0]))
+    return {
+        'layout': layout,
+        'values': num_values,
+        'convert_seconds': convert_seconds,
+        'output_bytes': sum(path.getsize(path.join(package_dir, name)) for name in listdir(package_dir) if name != '__pycache__'),
+        'import_seconds': float(import_seconds),
+        'access_seconds': float(access_seconds),
+        'import_rss_kib': int(import_rss),
+        'access_rss_kib': int(access_rss)
+    }
+
+
+def benchmark_arrays(sizes=(100000, 1000000), repeat=3):
+
+    """
+    Measures every layout at every size and returns a list of result dicts
+    """
+
+    results = []
+    with TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            for layout in LAYOUTS:
+                results.append(measure_layout(layout, size, temp_dir, repeat=repeat))
+    return results
+
+
+def main():
+
+    if sys.platform.startswith('win'):
+        print('The arrays benchmark needs the resource module, which is not available on Windows')
+        return
+    print('{:>14} {:>8} {:>11} {:>11} {:>10} {:>10} {:>12} {:>12}'.format('layout', 'values', 'convert ms', 'output KiB', 'import ms',
+                                                                          'access ms', 'import KiB', 'access KiB'))
+    for result in benchmark_arrays():
+        print('{:>14} {:>8} {:>11.1f} {:>11.0f} {:>10.2f} {:>10.2f} {:>12} {:>12}'.format(result['layout'],
+                                                                                         result['values'],
+                                                                                         result['convert_seconds'] * 1000,
+                                                                                         result['output_bytes'] / 1024,
+                                                                                         result['import_seconds'] * 1000,
+                                                                                         result['access_seconds'] * 1000,
+                                                                                         result['import_rss_kib'],
+                                                                                         result['access_rss_kib']))
+
+
+if __name__ == "__main__":
+    main()
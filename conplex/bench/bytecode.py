@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures the cold import latency of a generated module on a filesystem
+where the interpreter cannot write bytecode, with and without compiling
+the module ahead of time.
+"""
+
+from tempfile import TemporaryDirectory
+from os import path
+
+from conplex.bench.generators import synthetic_config
+from conplex.bench.utils import measure_import
+from conplex.core import YAMLConverter
+
+MODES = (None, 'hash', 'sourceless')
+
+
+def benchmark_bytecode(num_keys=20000, repeat=5):
+
+    """
+    Generates the same synthetic configuration once per bytecode mode and
+    returns a list of result dicts with the import time of each mode. The
+    imports run with -B, so without ahead of time compilation every import
+    compiles the module again, like on a read-only filesystem
+
+    args:
+        num_keys: The number of leaf values in the configuration
+        repeat: The number of timed imports per mode. The fastest one is reported
+    """
+
+    import yaml
+
+    results = []
+    with TemporaryDirectory() as temp_dir:
+        yaml_path = path.join(temp_dir, 'bench.yaml')
+        with open(yaml_path, 'w') as yaml_file:
+            yaml.safe_dump(synthetic_config(num_keys), yaml_file)
+        for mode in MODES:
+            package = 'bench_{}'.format(mode or 'source')
+            YAMLConverter(yaml_path, output_dir=temp_dir + '/', module_name=package, silent=True, bytecode=mode)()
+            seconds, _ = measure_import(temp_dir, package, access=package + '.class_0', repeat=repeat, flags=['-B'])
+            results.append({
+                'bytecode': mode or 'none',
+                'keys': num_keys,
+                'import_seconds': seconds
+            })
+    return results
+
+
+def main():
+
+    print('{:>12} {:>8} {:>12}'.format('bytecode', 'keys', 'import ms'))
+    for result in benchmark_bytecode():
+        print('{:>12} {:>8} {:>12.2f}'.format(result['bytecode'], result['keys'], result['import_seconds'] * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures how the cost of emitting a module scales with the number of keys
+in its YAML file. Only the emit stage is timed, so parsing does not hide it.
+With a linear emitter the time and peak memory per key stay flat as the
+configuration grows.
+"""
+
+from os import path
+from shutil import rmtree
+from tempfile import TemporaryDirectory
+import tracemalloc
+
+from conplex.bench.generators import synthetic_config
+from conplex.core import YAMLConverter
+
+
+def benchmark_emitter(sizes=(1000, 2000, 4000, 8000, 16000, 32000), repeat=3):
+
+    """
+    Converts synthetic configurations of increasing size and returns a list of
+    result dicts with the best emit time and the peak memory of a conversion for each size
+
+    args:
+        sizes: The numbers of keys to benchmark
+        repeat: The number of conversions per size. The fastest emit stage is reported
+    """
+
+    import yaml
+
+    results = []
+    with TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            yaml_path = path.join(temp_dir, 'bench_{}.yaml'.format(size))
+            with open(yaml_path, 'w') as yaml_file:
+                yaml.safe_dump(synthetic_config(size), yaml_file)
+
+            module_dir = path.join(temp_dir, 'bench_{}'.format(size))
+            best = None
+            for _ in range(repeat):
+                rmtree(module_dir, ignore_errors=True)  # Every run converts into an empty module directory
+                converter = YAMLConverter(yaml_path, output_dir=temp_dir + '/', silent=True)
+                converter()
+                elapsed = converter.timings['emit']
+                best = elapsed if best is None else min(best, elapsed)
+
+            rmtree(module_dir, ignore_errors=True)
+            tracemalloc.start()
+            YAMLConverter(yaml_path, output_dir=temp_dir + '/', silent=True)()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            output_size = path.getsize(path.join(module_dir, 'config.py'))
+            results.append({
+                'keys': size,
+                'emit_seconds': best,
+                'microseconds_per_key': best / size * 1e6,
+                'peak_memory_bytes': peak,
+                'output_bytes': output_size
+            })
+    return results
+
+
+def main():
+
+    print('{:>8} {:>10} {:>10} {:>12} {:>12}'.format('keys', 'emit s', 'us/key', 'peak KiB', 'output KiB'))
+    for result in benchmark_emitter():
+        print('{:>8} {:>10.4f} {:>10.2f} {:>12.0f} {:>12.0f}'.format(result['keys'],
+                                                                   result['emit_seconds'],
+                                                                   result['microseconds_per_key'],
+                                                                   result['peak_memory_bytes'] / 1024,
+                                                                   result['output_bytes'] / 1024))
+
+
+if __name__ == "__main__":
+    main()
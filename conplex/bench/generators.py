@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+Generators for synthetic YAML configurations of realistic shapes. Each
+generator returns the YAML text of a configuration with roughly the
+requested number of leaf values.
+"""
+
+
+def _value(i):
+    # A mix of the value types found in configuration files
+    kind = i % 4
+    if kind == 0:
+        return str(i)
+    if kind == 1:
+        return 'value {}'.format(i)
+    if kind == 2:
+        return '{}.5'.format(i)
+    return 'true' if i % 8 == 3 else 'false'
+
+
+def synthetic_config(num_keys, width=10, depth=3):
+
+    """
+    Builds a configuration dict with roughly num_keys leaf values, grouped
+    into classes of width attributes that are nested depth levels deep
+
+    args:
+        num_keys: The number of leaf values in the configuration
+        width: The number of leaf values per class
+        depth: The nesting level of each top level class
+    """
+
+    config = {}
+    num_classes = max(1, num_keys // (width * depth))
+    for i in range(num_classes):
+        node = {}
+        config['class {}'.format(i)] = node
+        for level in range(depth):
+            for j in range(width):
+                node['attribute {}'.format(j)] = 'value {} {}'.format(i, j) if j % 2 else j
+            if level < depth - 1:
+                child = {}
+                node['nested {}'.format(level)] = child
+                node = child
+    return config
+
+
+def wide_flat(num_keys):
+
+    """
+    A single class with num_keys attributes of mixed types
+    """
+
+    lines = ['settings:']
+    for i in range(num_keys):
+        lines.append('  key {}: {}'.format(i, _value(i)))
+    return '\n'.join(lines) + '\n'
+
+
+def deeply_nested(num_keys, depth=40):
+
+    """
+    Chains of nested classes, depth levels deep, with the leaf values spread
+    evenly across the levels
+    """
+
+    per_level = max(1, num_keys // depth)
+    lines = []
+    for chain in range(max(1, num_keys // (per_level * depth))):
+        lines.append('chain {}:'.format(chain))
+        for level in range(depth):
+            indentation = '  ' * (level + 1)
+            for i in range(per_level):
+                lines.append('{}key {}: {}'.format(indentation, i, _value(i)))
+            if level < depth - 1:
+                lines.append('{}level {}:'.format(indentation, level + 1))
+    return '\n'.join(lines) + '\n'
+
+
+def anchors(num_keys, block_size=10):
+
+    """
+    A few anchored scalars, lists and mappings that are referenced through
+    aliases from many classes, like &width in example.yaml
+    """
+
+    lines = ['defaults:',
+             '  width: &width 1000',
+             '  title: &title "a fairly long default title that is repeated everywhere"',
+             '  sizes: &sizes [1, 2, 4, 8, 16, 32, 64, 128]',
+             '  block: &block']
+    for i in range(block_size):
+        lines.append('    key {}: {}'.format(i, _value(i)))
+    aliases = ('*width', '*title', '*sizes')
+    for i in range(max(1, num_keys // 4)):
+        lines.append('item {}:'.format(i))
+        for j, alias in enumerate(aliases):
+            lines.append('  alias {}: {}'.format(j, alias))
+        lines.append('  shared block: *block')
+    return '\n'.join(lines) + '\n'
+
+
+def large_lists(num_keys, length=1000):
+
+    """
+    Classes holding long numeric lists, num_keys list elements in total
+    """
+
+    lines = ['series:']
+    for i in range(max(1, num_keys // length)):
+        values = ', '.join(str(i * length + j) for j in range(length))
+        lines.append('  series {}: [{}]'.format(i, values))
+    return '\n'.join(lines) + '\n'
+
+
+def dict_blocks(num_keys, block_size=10):
+
+    """
+    Mappings carrying the !dict key suffix, which are written as dicts
+    instead of classes, inside and outside of classes
+    """
+
+    num_blocks = max(2, num_keys // block_size)
+    lines = ['blocks:']
+    for i in range(num_blocks // 2):
+        lines.append('  block {} !dict:'.format(i))
+        for j in range(block_size):
+            lines.append('    key {}: {}'.format(j, _value(j)))
+    for i in range(num_blocks - num_blocks // 2):
+        lines.append('top block {} !dict:'.format(i))
+        for j in range(block_size):
+            lines.append('  key {}: {}'.format(j, _value(j)))
+    return '\n'.join(lines) + '\n'
+
+
+SHAPES = {
+    'wide_flat': wide_flat,
+    'deeply_nested': deeply_nested,
+    'anchors': anchors,
+    'large_lists': large_lists,
+    'dict_blocks': dict_blocks
+}
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures YAML loading throughput of the libyaml and pure Python loader
+backends on large synthetic configuration files.
+"""
+
+from time import perf_counter
+
+from conplex.bench.generators import synthetic_config
+from conplex.core.loader import get_loader, LIBYAML, PYTHON
+
+
+def benchmark_loader(sizes=(10000, 50000, 100000), repeat=3):
+
+    """
+    Parses synthetic configurations of increasing size with each available
+    backend and returns a list of result dicts with the best parse time and
+    throughput for each size and backend
+
+    args:
+        sizes: The numbers of keys to benchmark
+        repeat: The number of parses per size and backend. The fastest one is reported
+    """
+
+    import yaml
+
+    results = []
+    for size in sizes:
+        source = yaml.safe_dump(synthetic_config(size)).encode('utf-8')
+        for backend in (LIBYAML, PYTHON):
+            loader, used = get_loader(backend)
+            if used != backend:
+                continue  # libyaml is not available
+            best = None
+            for _ in range(repeat):
+                start = perf_counter()
+                yaml.load(source, Loader=loader)
+                elapsed = perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results.append({
+                'keys': size,
+                'backend': backend,
+                'input_bytes': len(source),
+                'seconds': best,
+                'megabytes_per_second': len(source) / best / 1e6
+            })
+    return results
+
+
+def main():
+
+    print('{:>8} {:>8} {:>10} {:>10} {:>8}'.format('keys', 'backend', 'input KiB', 'seconds', 'MB/s'))
+    for result in benchmark_loader():
+        print('{:>8} {:>8} {:>10.0f} {:>10.4f} {:>8.2f}'.format(result['keys'],
+                                                              result['backend'],
+                                                              result['input_bytes'] / 1024,
+                                                              result['seconds'],
+                                                              result['megabytes_per_second']))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares the import time and memory of a generated module in the single
+config.py layout and in the split layout, when a single class is accessed.
+"""
+
+from os import path
+from tempfile import TemporaryDirectory
+
+from conplex.bench.generators import synthetic_config
+from conplex.bench.utils import measure_import
+from conplex.core import YAMLConverter
+
+
+def benchmark_split(num_classes=200, keys_per_class=60, repeat=5):
+
+    """
+    Generates the same synthetic configuration in both layouts and returns a
+    list of result dicts with the import time and memory of each layout
+
+    args:
+        num_classes: The number of top level classes in the configuration
+        keys_per_class: The number of leaf values in each class
+        repeat: The number of timed imports per layout
+    """
+
+    import yaml
+
+    results = []
+    with TemporaryDirectory() as temp_dir:
+        yaml_path = path.join(temp_dir, 'bench.yaml')
+        with open(yaml_path, 'w') as yaml_file:
+            config = synthetic_config(num_classes * keys_per_class, width=keys_per_class // 3)
+            yaml.safe_dump(config, yaml_file)
+        for split in (False, True):
+            package = 'bench_split' if split else 'bench_single'
+            YAMLConverter(yaml_path, output_dir=temp_dir + '/', module_name=package, silent=True, split=split)()
+            seconds, memory = measure_import(temp_dir, package, access=package + '.class_0', repeat=repeat)
+            results.append({
+                'layout': 'split' if split else 'single',
+                'classes': len(config),
+                'import_seconds': seconds,
+                'import_memory_bytes': memory
+            })
+    return results
+
+
+def main():
+
+    print('{:>8} {:>8} {:>12} {:>12}'.format('layout', 'classes', 'import ms', 'memory KiB'))
+    for result in benchmark_split():
+        print('{:>8} {:>8} {:>12.2f} {:>12.0f}'.format(result['layout'],
+                                                     result['classes'],
+                                                     result['import_seconds'] * 1000,
+                                                     result['import_memory_bytes'] / 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures the startup cost of ConPlex itself: the time it takes a fresh
+interpreter to import conplex and reach the entry points, which of the
+heavier dependencies that pulls in, and whether doing so leaves files
+behind in the working directory.
+"""
+
+from os import path, listdir
+from tempfile import TemporaryDirectory
+import subprocess
+import sys
+
+import conplex
+
+STARTUP_SCRIPT = '''
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+try:
+{statement}
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(name for name in {dependencies!r} if name in sys.modules))
+'''
+
+DEPENDENCIES = ('yaml', 'PrintTags', 'filelock', 'argparse', 'sqlite3', 'conplex.cli')
+
+STATEMENTS = {
+    'import conplex': 'import conplex',
+    'conplex.run': 'import conplex; conplex.run',
+    'ProjectManager()': 'import conplex; conplex.ProjectManager()',
+    'conplex --help': "from conplex.conplex import main; sys.argv = ['conplex', '--help']; main()"
+}
+
+
+def measure_startup(statement, repeat=5):
+
+    """
+    Runs a statement in fresh interpreters inside an empty working directory
+    and returns a result dict with the fastest time, the dependencies that
+    were imported and the files the statement created
+
+    args:
+        statement: The Python statement to time
+        repeat: The number of timed runs. The fastest one is reported
+    """
+
+    root = path.dirname(path.dirname(path.abspath(conplex.__file__)))
+    script = STARTUP_SCRIPT.format(root=root, statement='    ' + statement, dependencies=DEPENDENCIES)
+
+    def run(working_dir):
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=working_dir, stderr=subprocess.DEVNULL)
+        elapsed, dependencies = output.decode().rstrip('\n').split('\n')[-1].split(' ')
+        return float(elapsed), dependencies
+
+    with TemporaryDirectory() as temp_dir:
+        run(temp_dir)  # Warm up the bytecode cache
+        runs = [run(temp_dir) for _ in range(repeat)]
+        created = sorted(listdir(temp_dir))
+    best, dependencies = min(runs)
+    return {
+        'statement': statement,
+        'seconds': best,
+        'dependencies': dependencies.split(',') if dependencies else [],
+        'created_files': created
+    }
+
+
+def benchmark_startup(repeat=5):
+
+    """
+    Measures every statement in STATEMENTS and returns a list of result dicts
+    """
+
+    return [dict(measure_startup(statement, repeat=repeat), name=name) for name, statement in STATEMENTS.items()]
+
+
+def main():
+
+    print('{:>18} {:>9}  {:<40} {}'.format('entry point', 'ms', 'dependencies', 'created files'))
+    for result in benchmark_startup():
+        print('{:>18} {:>9.2f}  {:<40} {}'.format(result['name'],
+                                                  result['seconds'] * 1000,
+                                                  ', '.join(result['dependencies']) or '-',
+                                                  ', '.join(result['created_files']) or '-'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+"""
+The ConPlex benchmark suite. Converts synthetic configurations of every
+shape in conplex.bench.generators at several sizes and records the time of
+each conversion stage, the peak memory, the size of the generated module
+and its import time, along with the cost of the helpers in conplex.core.utils.
+Results are plain JSON, so runs of different ConPlex releases can be compared.
+"""
+
+from os import path
+from shutil import rmtree
+from tempfile import TemporaryDirectory
+from time import perf_counter, strftime, gmtime
+import platform
+import tracemalloc
+import json
+
+from conplex.bench.generators import SHAPES
+from conplex.bench.utils import measure_import
+from conplex.core import YAMLConverter
+from conplex.core import utils
+
+SIZES = (1000, 10000)
+
+
+def benchmark_shape(shape, num_keys, directory, repeat=3, import_time=True):
+
+    """
+    Converts one synthetic configuration and returns a result dict
+
+    args:
+        shape: The name of a generator in conplex.bench.generators.SHAPES
+        num_keys: The approximate number of leaf values in the configuration
+        directory: A scratch directory for the YAML file and the generated module
+        repeat: The number of conversions. The stage timings of the fastest one are reported. Each one
+        converts into an empty module directory, so that every run writes and publishes its files
+        import_time: Whether or not to measure the import time of the generated module
+    """
+
+    package = '{}_{}'.format(shape, num_keys)
+    yaml_path = path.join(directory, package + '.yaml')
+    with open(yaml_path, 'w') as yaml_file:
+        yaml_file.write(SHAPES[shape](num_keys))
+
+    best = None
+    for _ in range(repeat):
+        rmtree(path.join(directory, package), ignore_errors=True)  # Identical files already in place would not be written again
+        converter = YAMLConverter(yaml_path, output_dir=directory + '/', silent=True)
+        start = perf_counter()
+        converter()
+        elapsed = perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = elapsed, converter.timings
+
+    rmtree(path.join(directory, package), ignore_errors=True)
+    tracemalloc.start()
+    YAMLConverter(yaml_path, output_dir=directory + '/', silent=True)()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    elapsed, timings = best
+    result = {
+        'shape': shape,
+        'keys': num_keys,
+        'input_bytes': path.getsize(yaml_path),
+        'total_seconds': elapsed,
+        'parse_seconds': timings.get('parse', 0.0),
+        'emit_seconds': timings.get('emit', 0.0),
+        'write_seconds': timings.get('write', 0.0),
+        'publish_seconds': timings.get('publish', 0.0),
+        'peak_memory_bytes': peak,
+        'output_bytes': path.getsize(path.join(directory, package, 'config.py')),
+        'import_seconds': None
+    }
+    if import_time:
+        result['import_seconds'] = measure_import(directory, package, repeat=repeat)[0]
+    return result
+
+
+def benchmark_helpers(num_keys, repeat=3):
+
+    """
+    Times sort_dict_last and the case correction helpers on num_keys
+    distinct keys and returns a list of result dicts. The case correction
+    caches are cleared before every run, so the first translation of each
+    key is measured
+
+    args:
+        num_keys: The number of keys
+        repeat: The number of runs per helper. The fastest one is reported
+    """
+
+    keys = ['{} key {}'.format(('Page', 'XML', 'nested_value', 'someName')[i % 4], i) for i in range(num_keys)]
+    mapping = {key: ({} if i % 3 else i) for i, key in enumerate(keys)}
+    helpers = {
+        'sort_dict_last': lambda: utils.sort_dict_last(mapping),
+        'upper_camel_case': lambda: [utils.upper_camel_case(key) for key in keys],
+        'snake_case': lambda: [utils.snake_case(key) for key in keys]
+    }
+
+    results = []
+    for name, helper in helpers.items():
+        best = None
+        for _ in range(repeat):
+            utils.upper_camel_case.cache_clear()
+            utils.snake_case.cache_clear()
+            start = perf_counter()
+            helper()
+            elapsed = perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results.append({'helper': name, 'keys': num_keys, 'seconds': best})
+    return results
+
+
+def run_suite(sizes=SIZES, shapes=None, repeat=3, import_time=True):
+
+    """
+    Runs the whole suite and returns the results as a JSON serializable dict
+
+    args:
+        sizes: The numbers of leaf values to benchmark each shape with
+        shapes: The names of the shapes to benchmark. Defaults to all of them
+        repeat: The number of runs per measurement. The fastest one is reported
+        import_time: Whether or not to measure the import time of the generated modules
+    """
+
+    from conplex import __version__
+    from conplex.core.loader import get_loader
+
+    conversions = []
+    helpers = []
+    with TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            for shape in (shapes or SHAPES):
+                conversions.append(benchmark_shape(shape, size, temp_dir, repeat=repeat, import_time=import_time))
+            helpers.extend(benchmark_helpers(size, repeat=repeat))
+
+    return {
+        'conplex_version': __version__,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'yaml_loader': get_loader()[1],
+        'timestamp': strftime('%Y-%m-%dT%H:%M:%SZ', gmtime()),
+        'conversions': conversions,
+        'helpers': helpers
+    }
+
+
+def write_results(results, output_path):
+
+    """
+    Writes suite results to a JSON file
+    """
+
+    with open(output_path, 'w') as output_file:
+        json.dump(results, output_file, indent=4, sort_keys=True)
+
+
+def print_summary(results, file=None):
+
+    """
+    Prints a table of the conversion results and the helper timings
+
+    args:
+        results: The suite results, see run_suite
+        file: The stream the table is printed to. Defaults to sys.stdout
+    """
+
+    row = '{:>14} {:>7} {:>9} {:>9} {:>9} {:>10} {:>10} {:>10} {:>9}'
+    print(row.format('shape', 'keys', 'parse ms', 'emit ms', 'write ms', 'publish ms', 'peak KiB', 'output KiB', 'import ms'), file=file)
+    for result in results['conversions']:
+        print(row.format(result['shape'],
+                         result['keys'],
+                         '{:.2f}'.format(result['parse_seconds'] * 1000),
+                         '{:.2f}'.format(result['emit_seconds'] * 1000),
+                         '{:.2f}'.format(result['write_seconds'] * 1000),
+                         '{:.2f}'.format(result['publish_seconds'] * 1000),
+                         '{:.0f}'.format(result['peak_memory_bytes'] / 1024),
+                         '{:.0f}'.format(result['output_bytes'] / 1024),
+                         '{:.2f}'.format((result['import_seconds'] or 0) * 1000)), file=file)
+    print('', file=file)
+    print('{:>17} {:>7} {:>9}'.format('helper', 'keys', 'ms'), file=file)
+    for result in results['helpers']:
+        print('{:>17} {:>7} {:>9.2f}'.format(result['helper'], result['keys'], result['seconds'] * 1000), file=file)
+
+
+def main():
+    print_summary(run_suite())
+
+
+if __name__ == "__main__":
+    main()
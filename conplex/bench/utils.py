@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+
+IMPORT_SCRIPT = '''
+import sys, time, tracemalloc
+sys.path.insert(0, {directory!r})
+if {trace}:
+    tracemalloc.start()
+start = time.perf_counter()
+import {package}
+{access}
+elapsed = time.perf_counter() - start
+print(elapsed, tracemalloc.get_traced_memory()[0] if {trace} else 0)
+'''
+
+
+def measure_import(directory, package, access='pass', repeat=5, flags=()):
+
+    """
+    Imports a generated package in fresh interpreters and runs an access
+    statement on it. Returns the best import time in seconds and the memory
+    allocated by the import in bytes
+
+    args:
+        directory: The directory containing the package
+        package: The name of the package
+        access: A statement that is timed together with the import, e.g. package.Class
+        repeat: The number of timed imports. The fastest one is reported
+        flags: Additional command line flags for the interpreter, e.g. -B
+    """
+
+    def run(trace):
+        script = IMPORT_SCRIPT.format(directory=directory, package=package, access=access, trace=trace)
+        output = subprocess.check_output([sys.executable] + list(flags) + ['-c', script])
+        elapsed, memory = output.split()
+        return float(elapsed), int(memory)
+
+    run(False)  # Warm up the bytecode cache, unless flags prevent writing it
+    best = min(run(False)[0] for _ in range(repeat))
+    return best, run(True)[1]
@@ -1,9 +1,19 @@
 # -*- coding: utf-8 -*-
 
+from conplex._lazy import lazy_exports
+
 # TODO: Finish
 
-from .cli import CLI
-from .initialize_project import ProjectConstructor
-from .update_project import UpdateProject
-from .delete_project import DeleteProject
-__all__ = ['CLI', 'ProjectConstructor', 'UpdateProject', 'DeleteProject']
\ No newline at end of file
+_exports = {
+    'CLI': 'conplex.cli.cli',
+    'ProjectConstructor': 'conplex.cli.initialize_project',
+    'UpdateProject': 'conplex.cli.update_project',
+    'DeleteProject': 'conplex.cli.delete_project',
+    'WatchProject': 'conplex.cli.watch_project',
+    'ConvertTree': 'conplex.cli.convert_tree',
+    'ConvertStream': 'conplex.cli.convert_stream',
+    'Benchmark': 'conplex.cli.benchmark'
+}
+__all__ = list(_exports)
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
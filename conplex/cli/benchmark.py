@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+import PrintTags as pt
+import json
+import sys
+from conplex.bench.suite import run_suite, print_summary, write_results, SIZES
+
+
+class Benchmark(object):
+
+    """
+    Runs the ConPlex benchmark suite, prints a summary and writes the
+    results as JSON
+
+    args:
+        output_path: The path of the JSON results file. The results are printed as JSON if this is None,
+        and the summary is printed to stderr
+        sizes: The numbers of leaf values to benchmark each shape with
+        repeat: The number of runs per measurement
+    """
+
+    def __init__(self, output_path=None, sizes=SIZES, repeat=3):
+
+        # Without an output file stdout only carries the JSON results, so they can be redirected
+        report = sys.stderr if output_path is None else sys.stdout
+        pt.info('Running the ConPlex benchmark suite', file=report)
+        results = run_suite(sizes=sizes, repeat=repeat)
+        print('\n', file=report)
+        print_summary(results, file=report)
+        print('\n', file=report)
+        if output_path is None:
+            print(json.dumps(results, indent=4, sort_keys=True))
+        else:
+            write_results(results, output_path)
+            pt.success('Wrote benchmark results to {}'.format(output_path))
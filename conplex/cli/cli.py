@@ -2,7 +2,6 @@
 
 import PrintTags as pt
 from argparse import ArgumentParser
-from conplex.core.project_manager import ProjectManager
 
 
 class Arguments:
@@ -12,13 +11,18 @@ class Arguments:
     active: str = 'active'
     update: str = 'update'
     delete: str = 'delete'
+    watch: str = 'watch'
+    bench: str = 'bench'
+    migrate: str = 'migrate'
+    tree: str = 'tree'
+    stream: str = 'stream'
 
 
 class CLI(object):
 
     def __init__(self):
 
-        self.__manager = ProjectManager()
+        self.__project_manager = None
         self.__parser = ArgumentParser()
         self.__add_arguments()
         self.__args = self.__parser.parse_args()
@@ -26,21 +30,76 @@ class CLI(object):
     def __call__(self):
         self.__dispatch()
 
+    @property
+    def __manager(self):
+
+        """
+        Returns the project manager. The project is only opened by the commands that use it
+        """
+
+        if self.__project_manager is None:
+            from conplex.core.project_manager import ProjectManager
+            self.__project_manager = ProjectManager()
+        return self.__project_manager
+
     def __add_arguments(self):
         self.__parser.add_argument('selector')
+        self.__parser.add_argument('modules', nargs='*', help='The names of the modules to update, the directory tree converts, or the YAML file stream converts (- for stdin)')
+        self.__parser.add_argument('--all', action='store_true', dest='all_modules', help='Update all modules in the project')
+        self.__parser.add_argument('-w', '--workers', type=int, default=None, help='The number of worker processes used by update')
+        self.__parser.add_argument('--bytecode', choices=['hash', 'sourceless', 'none'], default=None, help='Compile updated modules ahead of time')
+        self.__parser.add_argument('-O', '--optimize', type=int, default=None, help='The optimization level of the compiled bytecode')
+        self.__parser.add_argument('--arrays', type=int, default=None, metavar='N',
+                                   help='Store numeric lists of at least N elements in a memory mapped sidecar file')
+        self.__parser.add_argument('--array-type', choices=['memoryview', 'array'], default=None,
+                                   help='How the lists stored with --arrays are exposed. Defaults to memoryview')
+        self.__parser.add_argument('--debounce', type=float, default=0.2, help='The number of seconds watch waits for changes to settle')
+        self.__parser.add_argument('--poll', action='store_true', help='Make watch poll for changes instead of using inotify')
+        self.__parser.add_argument('--output', default=None, help='The JSON file bench writes its results to, or the directory tree and stream write to')
+        self.__parser.add_argument('--key', default=None, help='The top level key whose value names the module of each document stream converts')
+        self.__parser.add_argument('--sizes', type=int, nargs='+', default=None, help='The numbers of keys bench generates configurations with')
+        self.__parser.add_argument('--repeat', type=int, default=3, help='The number of runs per bench measurement')
+        self.__parser.add_argument('--to', choices=['json', 'sqlite'], default='sqlite', help='The storage backend migrate moves the project to')
+        self.__parser.add_argument('--profile', default=None, help='The JSON file update and tree write per-stage profiles to, or - to print them')
+        self.__parser.add_argument('--overlay', action='append', dest='overlays', default=None,
+                                   help='A YAML file update merges over the module\'s YAML file. Repeat it to merge several files in order')
+        self.__parser.add_argument('--merge', action='append', default=None, metavar='KEY=STRATEGY',
+                                   help='How overlays are merged at a dotted key path: merge, replace, append or keep')
+        self.__parser.add_argument('--index', action='store_true', help='Make update emit a dotted path lookup index in each module')
+        self.__parser.add_argument('--cprofile', default=None, help='The file cProfile statistics of the command are dumped to. Conversions run in-process')
 
     def __dispatch(self):
 
         args = self.__args
 
+        if args.cprofile is not None:
+            from conplex.core.profiling import cprofile
+            args.workers = 1  # Worker processes are not seen by the profiler
+            cprofile_path, args.cprofile = args.cprofile, None
+            with cprofile(cprofile_path):
+                self.__dispatch()
+            return
+
         if args.selector == Arguments.init:
             self.__initialize()
         elif args.selector == Arguments.list:
             self.__list()
         elif args.selector == Arguments.active:
             self.__active()
+        elif args.selector == Arguments.update:
+            self.__update()
         elif args.selector == Arguments.delete:
             self.__delete()
+        elif args.selector == Arguments.watch:
+            self.__watch()
+        elif args.selector == Arguments.bench:
+            self.__bench()
+        elif args.selector == Arguments.migrate:
+            self.__migrate()
+        elif args.selector == Arguments.tree:
+            self.__tree()
+        elif args.selector == Arguments.stream:
+            self.__stream()
 
     def __initialize(self):
 
@@ -69,6 +128,110 @@ class CLI(object):
             return
         pt.green('\n"{}" is currently the active module\n'.format(active_module['module_name']))
 
+    def __update(self):
+
+        args = self.__args
+        from .update_project import UpdateProject
+        options = self.__conversion_options()
+        if args.overlays is not None:
+            options['overlays'] = args.overlays
+        if args.merge is not None:
+            merge = self.__parse_merge(args.merge)
+            if merge is None:
+                return
+            options['merge'] = merge
+        if args.index:
+            options['index'] = True
+        if args.all_modules:
+            UpdateProject(self.__manager, workers=args.workers, options=options, profile=args.profile)
+        elif args.modules:
+            UpdateProject(self.__manager, module_names=args.modules, workers=args.workers, options=options, profile=args.profile)
+        else:
+            active_module = self.__manager.active_module
+            if active_module is None:
+                pt.info('There no active ConPlex configurations in this project. Use --all or name the modules to update')
+                return
+            UpdateProject(self.__manager, module_names=[active_module['module_name']], workers=args.workers, options=options, profile=args.profile)
+
+    def __conversion_options(self):
+
+        """
+        Returns the module options given on the command line that update, tree and stream share
+        """
+
+        args = self.__args
+        options = {}
+        if args.bytecode is not None:
+            options['bytecode'] = None if args.bytecode == 'none' else args.bytecode
+        if args.optimize is not None:
+            options['optimize'] = args.optimize
+        if args.arrays is not None:
+            options['arrays'] = args.arrays
+        if args.array_type is not None:
+            options['array_type'] = args.array_type
+        return options
+
+    @staticmethod
+    def __parse_merge(values):
+
+        """
+        Returns the merge strategies given as KEY=STRATEGY arguments as a dict, or None if one of them is invalid
+        """
+
+        from conplex.core.overlay import STRATEGIES
+        merge = {}
+        for value in values:
+            key_path, _, strategy = value.partition('=')
+            if not key_path or strategy not in STRATEGIES:
+                pt.warn('Invalid merge strategy {}. Use KEY=STRATEGY, with one of {}'.format(value, ', '.join(STRATEGIES)))
+                return None
+            merge[key_path] = strategy
+        return merge
+
+    def __watch(self):
+
+        args = self.__args
+        from .watch_project import WatchProject
+        WatchProject(self.__manager, debounce=args.debounce, use_inotify=not args.poll)
+
+    def __bench(self):
+
+        args = self.__args
+        from .benchmark import Benchmark
+        if args.sizes:
+            Benchmark(output_path=args.output, sizes=args.sizes, repeat=args.repeat)
+        else:
+            Benchmark(output_path=args.output, repeat=args.repeat)
+
+    def __tree(self):
+
+        args = self.__args
+        from .convert_tree import ConvertTree
+        if len(args.modules) != 1:
+            pt.info('Please name the directory of YAML files to convert')
+            return
+        options = self.__conversion_options()
+        ConvertTree(args.modules[0], output_dir=args.output, workers=args.workers, options=options, profile=args.profile)
+
+    def __stream(self):
+
+        args = self.__args
+        from .convert_stream import ConvertStream
+        if len(args.modules) != 1:
+            pt.info('Please name the multi-document YAML file to convert, or - to read it from stdin')
+            return
+        options = self.__conversion_options()
+        ConvertStream(args.modules[0], output_dir=args.output, name_key=args.key, options=options)
+
+    def __migrate(self):
+
+        args = self.__args
+        if self.__manager.storage == args.to:
+            pt.info('The project is already stored with {}'.format(args.to))
+            return
+        self.__manager.migrate(args.to)
+        pt.success('Migrated {} module(s) to {}'.format(len(self.__manager.modules), args.to))
+
     def __delete(self):
         from .delete_project import DeleteProject
         DeleteProject(self.__manager)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+import PrintTags as pt
+from time import perf_counter
+from conplex.core.errors import ConversionError
+from conplex.core.stream import convert_stream
+
+
+class ConvertStream(object):
+
+    """
+    Converts each document of a multi-document YAML file, or of standard
+    input, into its own module and prints a summary of the modules
+
+    args:
+        yaml_path: The path of the YAML file, or - for standard input
+        output_dir: The directory the modules are placed in. Defaults to the directory of the YAML file
+        name_key: The top level key whose value names the module of each document. Documents are named by index otherwise
+        options: A dict of module options applied to every document
+    """
+
+    def __init__(self, yaml_path, output_dir=None, name_key=None, options=None):
+
+        start = perf_counter()
+        try:
+            results = convert_stream(yaml_path, output_dir=output_dir, name_key=name_key, **(options or {}))
+        except (ConversionError, ValueError) as e:
+            pt.warn(e)
+            return
+        elapsed = perf_counter() - start
+
+        for result in results:
+            pt.green('{:<32} document {:<4} {} classes, {} variable(s)'.format(result['module_name'],
+                                                                              result['values']['document'],
+                                                                              result['values']['num_classes'],
+                                                                              result['values']['num_variables']))
+        pt.success('Converted {} document(s) in {:.3f}s'.format(len(results), elapsed))
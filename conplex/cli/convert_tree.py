@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import PrintTags as pt
+from os import path
+from time import perf_counter
+from conplex.core.tree import convert_tree
+from conplex.core.profiling import write_profile
+
+
+class ConvertTree(object):
+
+    """
+    Converts a directory of YAML files into a package tree and prints a
+    summary of the files that were converted
+
+    args:
+        source_dir: The directory holding the YAML files
+        output_dir: The root directory of the generated package. Defaults to source_dir
+        workers: The number of worker processes. Defaults to the number of CPUs
+        options: A dict of module options applied to every file
+        profile: The JSON file the profile of each conversion is written to, or '-' to print them
+    """
+
+    def __init__(self, source_dir, output_dir=None, workers=None, options=None, profile=None):
+
+        if not path.isdir(source_dir):
+            pt.warn('{} is not a directory'.format(source_dir))
+            return
+
+        start = perf_counter()
+        try:
+            results = convert_tree(source_dir, output_dir=output_dir, workers=workers, profile=profile is not None, **(options or {}))
+        except ValueError as e:
+            pt.warn(e)
+            return
+        elapsed = perf_counter() - start
+
+        if profile is not None:
+            write_profile([result['profile'] for result in results if 'profile' in result], profile)
+        failed = [result for result in results if result['error'] is not None]
+        updated = [result for result in results if result['updated']]
+        for result in sorted(failed, key=lambda result: result['yaml_path']):
+            pt.red('{} failed: {}'.format(result['yaml_path'], result['error']))
+        message = 'Converted {} of {} YAML file(s) in {:.3f}s, {} unchanged'.format(len(updated), len(results), elapsed,
+                                                                                    len(results) - len(updated) - len(failed))
+        if failed:
+            pt.warn('{}, {} failed'.format(message, len(failed)))
+        else:
+            pt.success(message)
@@ -33,7 +33,7 @@ class ProjectConstructor(object):
             }
 
             manager.create_module(module_options, set_active=set_active)
-            manager.update_project_file()
+            manager.update_project_file([module_options])
 
     @staticmethod
     def __query_confirmation():
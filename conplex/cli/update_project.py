@@ -1,7 +1,59 @@
 # -*- coding: utf-8 -*-
 
+import PrintTags as pt
+from time import perf_counter
+from conplex.core.project_manager import ProjectManager
+from conplex.core.profiling import write_profile
+
 
 class UpdateProject(object):
 
-    def __init__(self):
-        pass
\ No newline at end of file
+    """
+    Regenerates registered modules from their YAML files and prints a
+    timing summary for each of them
+
+    args:
+        manager: The project manager
+        module_names: The names of the modules to update. All modules are updated if this is None
+        workers: The number of worker processes. Defaults to the number of CPUs
+        options: A dict of module options that is stored for each updated module
+        profile: The JSON file the profile of each conversion is written to, or '-' to print them
+    """
+
+    def __init__(self, manager: ProjectManager, module_names=None, workers=None, options=None, profile=None):
+
+        if not len(manager.modules):
+            pt.info('There are no ConPlex configurations in this project')
+            return
+
+        start = perf_counter()
+        try:
+            results = manager.update_modules(module_names, workers=workers, options=options, profile=profile is not None)
+        except ModuleNotFoundError as e:
+            pt.warn(e)
+            return
+        elapsed = perf_counter() - start
+
+        if profile is not None:
+            write_profile([result['profile'] for result in results if 'profile' in result], profile)
+        self.__print_summary(results)
+        failed = [result for result in results if result['error'] is not None]
+        updated = [result for result in results if result['updated']]
+        message = 'Updated {} of {} module(s) in {:.3f}s'.format(len(updated), len(results), elapsed)
+        if failed:
+            pt.warn('{}, {} failed'.format(message, len(failed)))
+        else:
+            pt.success(message)
+
+    @staticmethod
+    def __print_summary(results):
+        print('\n')
+        for result in sorted(results, key=lambda result: result['module_name']):
+            line = '{:<32} {:>8.3f}s  '.format(result['module_name'], result['seconds'])
+            if result['error'] is not None:
+                pt.red(line + 'failed: {}'.format(result['error']))
+            elif result['updated']:
+                pt.green(line + 'updated')
+            else:
+                pt.cyan(line + 'unchanged')
+        print('\n')
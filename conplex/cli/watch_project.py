@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import PrintTags as pt
+from conplex.core.project_manager import ProjectManager
+from conplex.core.watcher import Watcher
+
+
+class WatchProject(object):
+
+    """
+    Watches the YAML files of all modules in the project and regenerates
+    each module when its YAML file changes, until interrupted
+
+    args:
+        manager: The project manager
+        debounce: The number of seconds without further changes before a rebuild starts
+        use_inotify: Whether or not to use inotify when it is available
+    """
+
+    def __init__(self, manager: ProjectManager, debounce=0.2, use_inotify=True):
+
+        if not len(manager.modules):
+            pt.info('There are no ConPlex configurations in this project')
+            return
+
+        watcher = Watcher(manager, debounce=debounce, use_inotify=use_inotify, callback=self.__report)
+        pt.info('Watching {} module(s) using {}. Press Ctrl+C to stop'.format(len(manager.modules), watcher.backend))
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            watcher.stop()
+            print('')
+
+    @staticmethod
+    def __report(result):
+        if result['error'] is not None:
+            pt.warn('{} failed: {}'.format(result['module_name'], result['error']))
+        elif result['updated']:
+            pt.success('Regenerated {} in {:.1f}ms'.format(result['module_name'], result['seconds'] * 1000))
@@ -6,14 +6,76 @@ When executed from the command line, main() will be invoked. When
 imported into a python file, run() is used.
 """
 
-from conplex.core import YAMLConverter
-from .cli import CLI
+from os import path
 
+from conplex.core.yaml_converter import YAMLConverter
 
-def run(yaml_path, output_dir=None, module_name=None, case_correction=False, verbose=False, silent=False):
-    YAMLConverter(yaml_path, output_dir=output_dir, module_name=module_name, case_correction=case_correction, verbose=verbose, silent=silent)()
+
+def run(yaml_path, output_dir=None, module_name=None, case_correction=False, verbose=False, silent=False, loader='auto', split=False,
+        bytecode=None, optimize=-1, deduplicate=False, flatten=False, workers=None, profile=None, cprofile=None, documents=False, name_key=None,
+        overlays=None, merge=None, index=False, arrays=None, array_type='memoryview'):
+
+    """
+    Converts a YAML file, or a directory of YAML files, see YAMLConverter and
+    conplex.core.tree.convert_tree for the arguments. Overlays and merge
+    strategies only apply to single YAML files, so a ValueError is raised
+    if they are given with documents or a directory
+
+    args:
+        documents: (bool) Whether or not to convert each document of a multi-document YAML file into its own module, see
+        conplex.core.stream.convert_stream. This is implied if yaml_path is '-', which reads the YAML from standard input.
+        Streams are always converted in full, as they have no fingerprint to skip unchanged documents with
+        name_key: (string) With documents, a top level key whose value names the module of each document
+        overlays: (list) The paths of YAML files merged over the YAML file, in order, see YAMLConverter
+        merge: (dict) Maps dotted key paths, or patterns of them, to the strategy overlays are merged with there, see YAMLConverter
+        index: (bool) Whether or not to emit the dotted path lookup index of each module, see YAMLConverter
+        arrays: (int) The minimum number of elements of the numeric lists stored in a binary sidecar file, see YAMLConverter
+        array_type: (string) How the stored lists are exposed, 'memoryview' or 'array', see YAMLConverter
+        profile: (string) The path of a JSON file the profile of the conversion is written to, or '-' to print it
+        cprofile: (string) The path of a file cProfile statistics of the conversion are dumped to
+    """
+
+    if cprofile is not None:
+        from conplex.core.profiling import cprofile as cprofile_context
+        with cprofile_context(cprofile):
+            return run(yaml_path, output_dir=output_dir, module_name=module_name, case_correction=case_correction, verbose=verbose, silent=silent, loader=loader,
+                       split=split, bytecode=bytecode, optimize=optimize, deduplicate=deduplicate, flatten=flatten, workers=1, profile=profile,
+                       documents=documents, name_key=name_key, overlays=overlays, merge=merge, index=index, arrays=arrays,
+                       array_type=array_type)
+
+    is_stream = documents or yaml_path == '-'
+    if (is_stream or path.isdir(yaml_path)) and (overlays or merge):
+        raise ValueError('Overlays and merge strategies can only be used to convert a single YAML file, not {}'.format(
+            'a YAML stream' if is_stream else 'a directory'))
+
+    if is_stream:
+        # Every document of the stream becomes a module, see conplex.core.stream.convert_stream
+        from conplex.core.stream import convert_stream
+        return convert_stream(yaml_path, output_dir=output_dir, name_key=name_key, prefix=module_name, loader=loader, case_correction=case_correction,
+                              verbose=verbose, split=split, bytecode=bytecode, optimize=optimize, deduplicate=deduplicate, flatten=flatten, index=index,
+                              arrays=arrays, array_type=array_type)
+
+    if path.isdir(yaml_path):
+        # A directory of YAML files is converted into a package tree, see conplex.core.tree.convert_tree
+        from conplex.core.tree import convert_tree
+        results = convert_tree(yaml_path, output_dir=output_dir, workers=workers, profile=profile is not None, case_correction=case_correction, loader=loader,
+                               split=split, bytecode=bytecode, optimize=optimize, deduplicate=deduplicate, flatten=flatten, index=index, arrays=arrays,
+                               array_type=array_type)
+        if profile is not None:
+            from conplex.core.profiling import write_profile
+            write_profile([result['profile'] for result in results if 'profile' in result], profile)
+        return results
+
+    converter = YAMLConverter(yaml_path, output_dir=output_dir, module_name=module_name, case_correction=case_correction, verbose=verbose, silent=silent, loader=loader,
+                              split=split, bytecode=bytecode, optimize=optimize, deduplicate=deduplicate, flatten=flatten, profile=profile is not None,
+                              overlays=overlays, merge=merge, index=index, arrays=arrays, array_type=array_type)
+    converter()
+    if profile is not None:
+        from conplex.core.profiling import write_profile
+        write_profile(converter.profile, profile)
 
 
 def main():
 
+    from conplex.cli.cli import CLI  # Deferred, so that library users calling run() never import the CLI
     CLI()()
@@ -1,3 +1,21 @@
-from .project_manager import ProjectManager
-from .yaml_converter import YAMLConverter
-__all__ = ['ProjectManager', 'YAMLConverter']
\ No newline at end of file
+# -*- coding: utf-8 -*-
+
+from conplex._lazy import lazy_exports
+
+_exports = {
+    'ProjectManager': 'conplex.core.project_manager',
+    'YAMLConverter': 'conplex.core.yaml_converter',
+    'AsyncConverter': 'conplex.core.async_converter',
+    'convert_async': 'conplex.core.async_converter',
+    'ConPlexError': 'conplex.core.errors',
+    'ConversionError': 'conplex.core.errors',
+    'YAMLNotFoundError': 'conplex.core.errors',
+    'YAMLParseError': 'conplex.core.errors',
+    'OutputError': 'conplex.core.errors',
+    'CompileError': 'conplex.core.errors',
+    'convert_tree': 'conplex.core.tree',
+    'convert_stream': 'conplex.core.stream'
+}
+__all__ = list(_exports)
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
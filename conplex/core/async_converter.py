@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Runs conversions from asyncio code. Each conversion reads, parses, emits and
+writes its module in an executor, so the event loop keeps serving while it
+runs, and a semaphore bounds the number of conversions in flight. Errors are
+raised as ConversionError subclasses, see conplex.core.errors, instead of
+exiting the process.
+"""
+
+import asyncio
+from functools import partial
+from os import cpu_count, path
+
+from .batch import convert_module
+
+
+def module_from_path(yaml_path, output_dir=None, module_name=None, **options):
+
+    """
+    Returns a module dict, as stored in the project data, for a YAML file that
+    is not registered in the project
+
+    args:
+        yaml_path: (string) The path to the YAML file
+        output_dir: (string) The directory the generated module is placed in. Defaults to the directory of the YAML file
+        module_name: (string) The name of the generated module. Defaults to the YAML file name
+        options: Module options, as stored for registered modules, e.g. case_correction or split
+    """
+
+    if module_name is None:
+        module_name = path.basename(yaml_path).split('.')[0].replace(' ', '_')
+    module = {'case_correction': False}
+    module.update(options)
+    module['yaml_path'] = yaml_path
+    module['module_name'] = module_name
+    module['output_dir'] = None if output_dir is None else path.join(output_dir, '')  # The converter expects a trailing separator
+    return module
+
+
+class AsyncConverter(object):
+
+    """
+    Converts YAML files without blocking the event loop. One converter can be
+    shared by every task of an application, so that its limit applies to all
+    of their conversions together
+
+    args:
+        limit: (int) The maximum number of conversions that run at the same time. Defaults to the number of CPUs
+        executor: The concurrent.futures executor the conversions run in. Defaults to the default executor
+        of the event loop, a thread pool. Parsing holds the GIL, so a ProcessPoolExecutor lets large
+        conversions run in parallel, at the cost of sending each module and result between processes
+    """
+
+    def __init__(self, limit=None, executor=None):
+
+        self.__limit = limit or cpu_count() or 1
+        self.__executor = executor
+        self.__semaphore = None  # Created on first use, inside the event loop it guards
+
+    @property
+    def limit(self):
+        return self.__limit
+
+    async def convert(self, yaml_path, output_dir=None, module_name=None, profile=False, **options):
+
+        """
+        Converts a YAML file and returns a result dict, see conplex.core.batch.convert_module.
+        Raises a ConversionError if the file can not be converted
+
+        args:
+            yaml_path: (string) The path to the YAML file
+            output_dir: (string) The directory the generated module is placed in. Defaults to the directory of the YAML file
+            module_name: (string) The name of the generated module. Defaults to the YAML file name
+            profile: (bool) Whether or not to add the profile of the conversion to the result
+            options: Module options, as stored for registered modules, e.g. fingerprint, split or bytecode
+        """
+
+        module = module_from_path(yaml_path, output_dir=output_dir, module_name=module_name, **options)
+        return await self.convert_module(module, profile=profile)
+
+    async def convert_module(self, module, profile=False):
+
+        """
+        Regenerates a registered module and returns a result dict, see
+        conplex.core.batch.convert_module. Raises a ConversionError if the
+        module can not be converted
+
+        args:
+            module: The module dict, as stored in the project data
+            profile: (bool) Whether or not to add the profile of the conversion to the result
+        """
+
+        return await self.__run(partial(convert_module, module, profile=profile, raise_errors=True))
+
+    async def convert_modules(self, modules, profile=False):
+
+        """
+        Regenerates several modules concurrently and yields their result dicts
+        as they complete. A failed conversion does not stop the others, its
+        error is recorded in its result instead, as for conplex.core.batch.convert_modules.
+        Closing the generator early cancels the conversions that have not started
+
+        args:
+            modules: A list of module dicts, see module_from_path for YAML files that are not registered
+            profile: (bool) Whether or not to add the profile of each conversion to its result
+        """
+
+        tasks = [asyncio.ensure_future(self.__run(partial(convert_module, module, profile=profile))) for module in modules]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def gather(self, modules, profile=False):
+
+        """
+        Regenerates several modules concurrently and returns their result
+        dicts, in the order of the modules
+
+        args:
+            modules: A list of module dicts, see module_from_path for YAML files that are not registered
+            profile: (bool) Whether or not to add the profile of each conversion to its result
+        """
+
+        return await asyncio.gather(*(self.__run(partial(convert_module, module, profile=profile)) for module in modules))
+
+    async def __run(self, function):
+
+        """
+        Runs a function in the executor once a conversion slot is free
+        """
+
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.__limit)
+        async with self.__semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__executor, function)
+
+
+async def convert_async(yaml_path, output_dir=None, module_name=None, profile=False, **options):
+
+    """
+    Converts a YAML file in the default executor of the running event loop,
+    see AsyncConverter.convert. Use a shared AsyncConverter to limit the
+    number of conversions that run at the same time
+    """
+
+    return await AsyncConverter(limit=1).convert(yaml_path, output_dir=output_dir, module_name=module_name, profile=profile, **options)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+from .yaml_converter import YAMLConverter
+
+
+def convert_module(module, profile=False, raise_errors=False):
+
+    """
+    Regenerates a single registered module. By default this function never
+    raises, so that a bad YAML file only fails its own job when it runs in a
+    batch. Instead, it returns a result dict with the new registry values of
+    the module, whether or not it was regenerated, the error if there was
+    one, and the time the conversion took. An output_dir in the module dict
+    overrides the default of placing the module next to its YAML file
+
+    args:
+        module: The module dict, as stored in the project data
+        profile: Whether or not to add the profile of the conversion to the result, see YAMLConverter.profile
+        raise_errors: Whether or not errors are raised, see conplex.core.errors, instead of being recorded in the result
+    """
+
+    result = {
+        'module_name': module['module_name'],
+        'yaml_path': module['yaml_path'],
+        'updated': False,
+        'error': None,
+        'seconds': 0.0,
+        'values': {}
+    }
+    start = perf_counter()
+    try:
+        generator = YAMLConverter.from_module(module, silent=True, profile=profile, raise_errors=True)
+        counts = generator()
+    except Exception as e:
+        if raise_errors:
+            raise
+        result['error'] = '{}: {}'.format(type(e).__name__, e)
+    else:
+        result['values']['fingerprint'] = generator.fingerprint
+        result['values']['dependencies'] = generator.dependencies
+        if counts is not None:
+            result['updated'] = True
+            result['values']['num_classes'], result['values']['num_variables'] = counts
+        if profile:
+            result['profile'] = generator.profile
+    result['seconds'] = perf_counter() - start
+    return result
+
+
+def convert_modules(modules, workers=None, profile=False):
+
+    """
+    Regenerates several registered modules on a process pool and yields the
+    result dict of each one as soon as it is done
+
+    args:
+        modules: A list of module dicts, as stored in the project data
+        workers: The number of worker processes. Defaults to the number of CPUs.
+        With a single worker, the modules are converted in the current process
+        profile: Whether or not to add the profile of each conversion to its result
+    """
+
+    if workers == 1 or len(modules) < 2:
+        for module in modules:
+            yield convert_module(module, profile=profile)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(convert_module, module, profile): module for module in modules}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # The worker process itself died
+                yield {
+                    'module_name': futures[future]['module_name'],
+                    'yaml_path': futures[future]['yaml_path'],
+                    'updated': False,
+                    'error': '{}: {}'.format(type(e).__name__, e),
+                    'seconds': 0.0,
+                    'values': {}
+                }
+
+
+if __name__ == "__main__":
+    pass
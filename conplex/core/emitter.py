@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+from os import path
+
+
+class CodeEmitter(object):
+
+    """
+    Collects generated Python source as a list of chunks. Chunks are never
+    concatenated with each other, so emitting a module costs time and memory
+    linear in the size of the output. The collected source can be compared
+    against, and written to, a file chunk by chunk
+
+    args:
+        header: (string) Text the emitted source should start with
+    """
+
+    def __init__(self, header=''):
+
+        self.__chunks = []  # The emitted pieces of source, in order
+        self.__size = 0  # The total number of characters emitted
+        if header:
+            self.write(header)
+
+    def __len__(self):
+        return self.__size
+
+    def write(self, text):
+
+        """
+        Appends a piece of source to the output
+        """
+
+        self.__chunks.append(text)
+        self.__size += len(text)
+
+    def line(self, text='', indentation=''):
+
+        """
+        Appends a single line of source, followed by a newline
+
+        args:
+            text: The content of the line
+            indentation: A string of spaces the line should be indented with
+        """
+
+        self.write(indentation + text + '\n')
+
+    def getvalue(self):
+
+        """
+        Returns the emitted source as a single string
+        """
+
+        return ''.join(self.__chunks)
+
+    def write_to(self, output_file):
+
+        """
+        Writes the emitted source to an open file handle
+        """
+
+        output_file.writelines(self.__chunks)
+
+    def matches(self, file_path):
+
+        """
+        Checks if the file at file_path already contains exactly the emitted
+        source. The file is read in pieces the size of each chunk, so the
+        comparison stops at the first difference
+        """
+
+        if not path.isfile(file_path):
+            return False
+        try:
+            with open(file_path, 'r') as existing_file:
+                for chunk in self.__chunks:
+                    if existing_file.read(len(chunk)) != chunk:
+                        return False
+                return existing_file.read(1) == ''
+        except (IOError, UnicodeDecodeError):
+            return False
+
+
+class ByteEmitter(object):
+
+    """
+    Collects generated binary content, such as the array sidecar file of a
+    module, as a list of bytes chunks
+    """
+
+    def __init__(self):
+
+        self.__chunks = []  # The emitted pieces of content, in order
+        self.__size = 0  # The total number of bytes emitted
+
+    def __len__(self):
+        return self.__size
+
+    def write(self, data):
+
+        """
+        Appends a piece of content to the output
+        """
+
+        self.__chunks.append(data)
+        self.__size += len(data)
+
+    def getvalue(self):
+
+        """
+        Returns the emitted content as a single bytes object
+        """
+
+        return b''.join(self.__chunks)
+
+    def write_to(self, output_file):
+
+        """
+        Writes the emitted content to a file handle opened in binary mode
+        """
+
+        output_file.writelines(self.__chunks)
+
+    def matches(self, file_path):
+
+        """
+        Checks if the file at file_path already contains exactly the emitted content
+        """
+
+        if not path.isfile(file_path) or path.getsize(file_path) != self.__size:
+            return False
+        try:
+            with open(file_path, 'rb') as existing_file:
+                for chunk in self.__chunks:
+                    if existing_file.read(len(chunk)) != chunk:
+                        return False
+                return True
+        except IOError:
+            return False
+
+
+if __name__ == "__main__":
+    pass
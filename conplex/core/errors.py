@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+Exceptions raised by conversions that are run with raise_errors set. The
+command line tool prints errors and exits instead, so these are for code
+that embeds ConPlex, e.g. a service that regenerates its configuration.
+"""
+
+
+class ConPlexError(Exception):
+
+    """
+    The base class of all ConPlex errors
+    """
+
+
+class ConversionError(ConPlexError):
+
+    """
+    Raised when a YAML file can not be converted. The original error, if
+    any, is available as __cause__
+
+    args:
+        message: (string) A description of the error
+        yaml_path: (string) The path of the YAML file that was being converted
+    """
+
+    def __init__(self, message, yaml_path=None):
+
+        super().__init__(message)
+        self.message = message
+        self.yaml_path = yaml_path
+
+    def __str__(self):
+        if self.yaml_path is None:
+            return self.message
+        return '{} ({})'.format(self.message, self.yaml_path)
+
+    def __reduce__(self):
+        # Keeps the exception picklable, so it can be raised across a process pool
+        return type(self), (self.message, self.yaml_path)
+
+
+class YAMLNotFoundError(ConversionError):
+
+    """
+    Raised when the YAML file does not exist or can not be read
+    """
+
+
+class YAMLParseError(ConversionError):
+
+    """
+    Raised when the YAML file, or a file it includes, is not valid YAML
+    """
+
+
+class OutputError(ConversionError):
+
+    """
+    Raised when the files of the generated module can not be written or published
+    """
+
+
+class CompileError(ConversionError):
+
+    """
+    Raised when the generated module can not be compiled to bytecode
+    """
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+from os import path
+import yaml
+from conplex.core.utils import FlaggedDict
+
+LIBYAML = 'libyaml'
+PYTHON = 'python'
+AUTO = 'auto'
+
+
+class PythonLoader(yaml.SafeLoader):
+
+    """
+    The pure Python safe loader, extended with the ConPlex tags
+    """
+
+    include_nodes = None  # Maps each !include node to the path of the file it included, set by load
+
+
+if yaml.__with_libyaml__:
+    class LibYAMLLoader(yaml.CSafeLoader):
+
+        """
+        The libyaml backed safe loader, extended with the ConPlex tags
+        """
+
+        include_nodes = None  # Maps each !include node to the path of the file it included, set by load
+else:
+    LibYAMLLoader = None
+
+
+def _fill_mapping(loader, value, node):
+
+    """
+    Fills a dict with the content of a mapping node. Keys whose value is an
+    !include tag are recorded in the origins of the loader, which map the id
+    of a mapping to the mapping and a dict from those keys to the path of the
+    file that supplied their value
+    """
+
+    value.update(loader.construct_mapping(node))
+    include_nodes = loader.include_nodes
+    if include_nodes:
+        keys = {}
+        for key_node, value_node in node.value:
+            include_path = include_nodes.get(value_node)
+            if include_path is not None:
+                keys[loader.construct_object(key_node)] = include_path
+        if keys:
+            loader.origins[id(value)] = (value, keys)
+
+
+def construct_mapping(loader, node):
+
+    """
+    Constructs the value of a plain mapping, like the safe loader does, and
+    records the files of its included values
+    """
+
+    value = {}
+    yield value
+    _fill_mapping(loader, value, node)
+
+
+def construct_flagged_dict(loader, node):
+
+    """
+    Constructs the value of a mapping tagged with !dict. The mapping is
+    written as a dict rather than a class, just like a key with the !dict suffix
+    """
+
+    value = FlaggedDict()
+    yield value
+    _fill_mapping(loader, value, node)
+
+
+def construct_include(loader, node):
+
+    """
+    Constructs the value of an !include tag. A single path is replaced by the
+    content of that YAML file. A list of paths is replaced by the mappings of
+    all of those files merged in order, so later files override earlier ones.
+    Paths are relative to the file containing the tag
+    """
+
+    if isinstance(node, yaml.SequenceNode):
+        merged = {}
+        keys = {}  # Maps each key of the merged mapping to the file that supplied it
+        for file_path in loader.construct_sequence(node):
+            include_path, content = _load_include(loader, file_path, node)
+            if not isinstance(content, dict):
+                raise yaml.constructor.ConstructorError(None, None, 'can only merge mappings, but {} is not one'.format(file_path), node.start_mark)
+            merged.update(content)
+            keys.update(dict.fromkeys(content, include_path))
+        loader.origins[id(merged)] = (merged, keys)
+        return merged
+    include_path, content = _load_include(loader, loader.construct_scalar(node), node)
+    loader.include_nodes[node] = include_path
+    return content
+
+
+def _load_include(loader, file_path, node):
+
+    """
+    Reads and parses an included YAML file, and records it in the includes of
+    the loader. Returns the normalized path of the file and its content
+    """
+
+    include_path = path.normpath(path.join(path.dirname(loader.include_path or ''), file_path))
+    if include_path in loader.include_stack:
+        raise yaml.constructor.ConstructorError(None, None, 'circular include of {}'.format(include_path), node.start_mark)
+    try:
+        with open(include_path, 'rb') as include_file:
+            source = include_file.read()
+    except IOError as e:
+        raise yaml.constructor.ConstructorError(None, None, 'could not include {}: {}'.format(include_path, e), node.start_mark)
+    loader.includes.setdefault(include_path, source)
+    return include_path, load(source, type(loader), include_path, loader.includes, loader.include_stack, loader.origins)
+
+
+for _loader in (PythonLoader, LibYAMLLoader):
+    if _loader is not None:
+        _loader.add_constructor('tag:yaml.org,2002:map', construct_mapping)
+        _loader.add_constructor('!dict', construct_flagged_dict)
+        _loader.add_constructor('!include', construct_include)
+
+
+def load(source, loader_class, file_path=None, includes=None, include_stack=(), origins=None):
+
+    """
+    Parses a YAML document with one of the loader classes of this module.
+    Files pulled in by !include tags, including those included by included
+    files, are recorded in includes
+
+    args:
+        source: (bytes) The YAML source
+        loader_class: The loader class, see get_loader
+        file_path: (string) The path of the YAML file, which includes are resolved against
+        includes: (dict) Maps the path of each included file to its raw content, in the order they were included
+        include_stack: The paths of the files that are currently being included, to detect circular includes
+        origins: (dict) Filled with the files that supplied included values, see _fill_mapping
+    """
+
+    loader = loader_class(source)
+    loader.include_path = file_path
+    loader.includes = includes if includes is not None else {}
+    loader.include_nodes = {}
+    loader.origins = origins if origins is not None else {}
+    loader.include_stack = include_stack + (path.normpath(file_path),) if file_path else include_stack
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
+
+
+def load_all(source, loader_class, file_path=None):
+
+    """
+    Parses the documents of a YAML stream one at a time, in a single pass
+    over the source. Yields a (document, includes) pair for each document,
+    where includes maps the path of each file the document included to its
+    raw content. Empty documents are yielded as None
+
+    args:
+        source: (bytes) The YAML source, or an open binary stream
+        loader_class: The loader class, see get_loader
+        file_path: (string) The path of the YAML file, which includes are resolved against
+    """
+
+    loader = loader_class(source)
+    loader.include_path = file_path
+    loader.include_stack = (path.normpath(file_path),) if file_path else ()
+    try:
+        while loader.check_data():
+            loader.includes = {}
+            loader.include_nodes = {}
+            loader.origins = {}
+            yield loader.get_data(), loader.includes
+    finally:
+        loader.dispose()
+
+
+def get_loader(backend=AUTO):
+
+    """
+    Returns the YAML loader class for the requested backend, and the name of
+    the backend that is actually used. libyaml is used whenever it is available
+    unless the pure Python backend is requested; if libyaml was requested but
+    PyYAML was built without it, the pure Python loader is used instead
+
+    args:
+        backend: (string) One of 'auto', 'libyaml' or 'python'
+    """
+
+    if backend not in (AUTO, LIBYAML, PYTHON):
+        raise ValueError('Unknown YAML loader backend: {}'.format(backend))
+    if backend != PYTHON and LibYAMLLoader is not None:
+        return LibYAMLLoader, LIBYAML
+    return PythonLoader, PYTHON
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+
+"""
+Merges a base YAML file with an ordered list of overlay files, such as
+environment overrides, so that the generated module holds the merged
+configuration. The file that supplied each value is recorded, and merged
+results are cached in memory, so converting the same set of files again
+does not parse and merge them again.
+"""
+
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from hashlib import sha256
+from threading import Lock
+import json
+
+from .utils import FlaggedDict
+
+MERGE = 'merge'  # Mappings are merged key by key, anything else is replaced
+REPLACE = 'replace'  # The overlay value replaces the base value as a whole
+APPEND = 'append'  # Lists of the overlay are appended to those of the base, anything else is replaced
+KEEP = 'keep'  # The base value is kept. For mappings, overlays only add the keys the base does not have
+STRATEGIES = (MERGE, REPLACE, APPEND, KEEP)
+
+MERGE_CACHE_SIZE = 32  # The number of merged results kept in memory
+
+_cache = OrderedDict()  # Maps the digest of a set of files and merge strategies to the merged data, its provenance and includes
+_cache_lock = Lock()
+_missing = object()
+
+
+def key_name(key):
+
+    """
+    Returns the name a key is matched and recorded by, which is the key
+    without the !dict flag. A key with the flag in one file and without it
+    in another refers to the same value
+    """
+
+    return key.replace('!dict', '').strip()
+
+
+def _join(key_path, name):
+    return '{}.{}'.format(key_path, name) if key_path else name
+
+
+class OverlayMerger(object):
+
+    """
+    Merges parsed YAML documents in order, recording the file that supplied
+    each value. The provenance maps the dotted path of every leaf value to
+    the path of its file, which is the included file for values pulled in
+    with !include. The elements of lists merged with the append strategy are
+    recorded individually, e.g. servers[2]
+
+    args:
+        merge: (dict) Maps dotted key paths, or fnmatch patterns of them such as services.*.hosts, to a merge strategy.
+        Mappings, including !dict blocks, are merged by default and other values are replaced
+    """
+
+    def __init__(self, merge=None):
+
+        merge = dict(merge or {})
+        for key_path, strategy in merge.items():
+            if strategy not in STRATEGIES:
+                raise ValueError('Unknown merge strategy for {}: {}'.format(key_path, strategy))
+        self.__exact = {key_path: strategy for key_path, strategy in merge.items() if not any(c in key_path for c in '*?[')}
+        self.__patterns = [(key_path, strategy) for key_path, strategy in merge.items() if key_path not in self.__exact]
+        self.__merged = _missing
+        self.__provenance = {}
+        self.__origins = {}  # The origins of the included values of the file being added, see the origins argument of conplex.core.loader.load
+
+    @property
+    def merged(self):
+        return None if self.__merged is _missing else self.__merged
+
+    @property
+    def provenance(self):
+        return self.__provenance
+
+    def add(self, file_path, data, origins=None):
+
+        """
+        Merges the parsed content of a file over everything added before it
+
+        args:
+            file_path: (string) The path of the file, as recorded in the provenance
+            data: The parsed content of the file
+            origins: (dict) The files that supplied the included values of the content, as recorded by conplex.core.loader.load
+        """
+
+        if data is None:
+            return  # An empty file
+        self.__origins = origins or {}
+        try:
+            self.__merged = self.__merge_value(self.__merged, data, file_path, '')
+        finally:
+            self.__origins = {}
+
+    def __origin(self, mapping, key, file_path):
+
+        """
+        Returns the path of the file that supplied the value of a key, which
+        is the included file if the value was pulled in with !include
+        """
+
+        origin = self.__origins.get(id(mapping))
+        if origin is None or origin[0] is not mapping:
+            return file_path
+        return origin[1].get(key, file_path)
+
+    def __strategy(self, key_path):
+
+        """
+        Returns the merge strategy configured for a key path, or None
+        """
+
+        strategy = self.__exact.get(key_path)
+        if strategy is None:
+            for pattern, pattern_strategy in self.__patterns:
+                if fnmatchcase(key_path, pattern):
+                    return pattern_strategy
+        return strategy
+
+    def __merge_value(self, base, value, file_path, key_path):
+
+        """
+        Returns the result of merging value over base. Neither is modified,
+        merged mappings and lists are new objects
+        """
+
+        if base is _missing:
+            self.__record(value, file_path, key_path)
+            return value
+        strategy = self.__strategy(key_path) or MERGE
+        if strategy == KEEP:
+            if isinstance(base, dict) and isinstance(value, dict):
+                return self.__add_missing(base, value, file_path, key_path)
+            return base
+        if strategy == MERGE and isinstance(base, dict) and isinstance(value, dict):
+            return self.__merge_mappings(base, value, file_path, key_path)
+        if strategy == APPEND and isinstance(base, list) and isinstance(value, list):
+            self.__append_provenance(key_path, len(base), len(value), file_path)
+            return base + value
+        if isinstance(base, (dict, list)):
+            self.__forget(key_path)
+        self.__record(value, file_path, key_path)
+        return value
+
+    def __merge_mappings(self, base, value, file_path, key_path):
+
+        """
+        Merges a mapping over another key by key. The result keeps the order
+        of the base, followed by the keys only the overlay has. It is a !dict
+        block if either of the mappings is one
+        """
+
+        flagged = isinstance(base, FlaggedDict) or isinstance(value, FlaggedDict)
+        result = FlaggedDict(base) if flagged else dict(base)
+        keys = {key_name(key): key for key in result}
+        for key, child in value.items():
+            name = key_name(key)
+            child_path = _join(key_path, name)
+            child_file = self.__origin(value, key, file_path)
+            base_key = keys.get(name)
+            if base_key is None:
+                keys[name] = key
+                result[key] = child
+                self.__record(child, child_file, child_path)
+                continue
+            merged = self.__merge_value(result[base_key], child, child_file, child_path)
+            if '!dict' in key and '!dict' not in base_key and isinstance(merged, dict) and not isinstance(merged, FlaggedDict):
+                merged = FlaggedDict(merged)  # The overlay flags a block the base did not, and the base key is kept
+            result[base_key] = merged
+        return result
+
+    def __add_missing(self, base, value, file_path, key_path):
+
+        """
+        Adds the keys of an overlay mapping that the base mapping does not
+        have, keeping the values of the keys it has as they are
+        """
+
+        result = None
+        keys = {key_name(key) for key in base}
+        for key, child in value.items():
+            name = key_name(key)
+            if name in keys:
+                continue
+            if result is None:
+                result = FlaggedDict(base) if isinstance(base, FlaggedDict) else dict(base)
+            keys.add(name)
+            result[key] = child
+            self.__record(child, self.__origin(value, key, file_path), _join(key_path, name))
+        return base if result is None else result
+
+    def __record(self, value, file_path, key_path):
+
+        """
+        Records the file of a value and, for mappings, of every value inside it
+        """
+
+        stack = [(value, key_path, file_path)]
+        while stack:
+            value, key_path, file_path = stack.pop()
+            if isinstance(value, dict) and value:
+                for key, child in value.items():
+                    stack.append((child, _join(key_path, key_name(key)), self.__origin(value, key, file_path)))
+            elif key_path:
+                self.__provenance[key_path] = file_path
+
+    def __append_provenance(self, key_path, base_length, length, file_path):
+
+        """
+        Records the elements of an appended list individually
+        """
+
+        provenance = self.__provenance
+        base_file = provenance.pop(key_path, None)
+        for i in range(base_length):
+            if base_file is not None:
+                provenance['{}[{}]'.format(key_path, i)] = base_file
+        for i in range(base_length, base_length + length):
+            provenance['{}[{}]'.format(key_path, i)] = file_path
+
+    def __forget(self, key_path):
+
+        """
+        Removes the records of a value that is replaced, and of everything inside it
+        """
+
+        prefixes = (key_path + '.', key_path + '[')
+        for recorded in [recorded for recorded in self.__provenance if recorded == key_path or recorded.startswith(prefixes)]:
+            del self.__provenance[recorded]
+
+
+def merge_files(files, loader_class, merge=None, includes=None):
+
+    """
+    Parses and merges YAML files in order. Returns the merged data and its
+    provenance. Results are cached by the content of the files, the merge
+    strategies and the loader, and a cached result is only used if the files
+    it included are unchanged
+
+    args:
+        files: A list of (path, bytes) pairs, the base file first and then the overlays
+        loader_class: The loader class, see conplex.core.loader.get_loader
+        merge: (dict) The merge strategies, see OverlayMerger
+        includes: (dict) Filled with the path and raw bytes of every file included by one of the files
+    """
+
+    from .loader import load
+
+    includes = includes if includes is not None else {}
+    digest = sha256()
+    digest.update(json.dumps([loader_class.__name__, merge or {}], sort_keys=True).encode('utf-8'))
+    for file_path, source in files:
+        digest.update('\n{}:{}\n'.format(file_path, len(source)).encode('utf-8'))
+        digest.update(source)
+    cache_key = digest.hexdigest()
+
+    with _cache_lock:
+        entry = _cache.get(cache_key)
+        if entry is not None:
+            _cache.move_to_end(cache_key)
+    if entry is not None and _unchanged(entry[2]):
+        includes.update(entry[2])
+        return entry[0], dict(entry[1])
+
+    merger = OverlayMerger(merge)
+    file_includes = {}
+    for file_path, source in files:
+        origins = {}
+        data = load(source, loader_class, file_path, file_includes, origins=origins)
+        merger.add(file_path, data, origins)
+    includes.update(file_includes)
+
+    with _cache_lock:
+        _cache[cache_key] = (merger.merged, dict(merger.provenance), file_includes)
+        while len(_cache) > MERGE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return merger.merged, merger.provenance
+
+
+def _unchanged(includes):
+
+    """
+    Checks if every included file still holds the content it had when it was included
+    """
+
+    for include_path, source in includes.items():
+        try:
+            with open(include_path, 'rb') as include_file:
+                if include_file.read() != source:
+                    return False
+        except IOError:
+            return False
+    return True
+
+
+def clear_cache():
+
+    """
+    Empties the cache of merged results
+    """
+
+    with _cache_lock:
+        _cache.clear()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+Helpers for profiling conversions. YAMLConverter collects timing, byte and
+node counts for each stage of a conversion when profiling is enabled; the
+functions in this module count the nodes of parsed YAML, read the state of
+the case correction caches, and write profiles as JSON or cProfile dumps.
+"""
+
+from contextlib import contextmanager
+import json
+import sys
+
+from . import utils
+
+
+def count_nodes(data):
+
+    """
+    Returns the number of nodes in parsed YAML content, counting every
+    mapping, list and scalar once
+
+    args:
+        data: The parsed YAML content
+    """
+
+    count = 0
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return count
+
+
+def case_cache_info():
+
+    """
+    Returns the total number of hits and misses of the case correction caches
+    """
+
+    hits = misses = 0
+    for function in (utils.upper_camel_case, utils.snake_case, utils.constant_case):
+        info = function.cache_info()
+        hits += info.hits
+        misses += info.misses
+    return hits, misses
+
+
+def write_profile(profile, file_path):
+
+    """
+    Writes a profile, or a list of profiles, as JSON
+
+    args:
+        profile: A profile dict, see YAMLConverter.profile, or a list of them
+        file_path: The path of the JSON file. The profile is printed if this is '-'
+    """
+
+    json_data = json.dumps(profile, indent=4, sort_keys=True)
+    if file_path == '-':
+        sys.stdout.write(json_data + '\n')
+        return
+    with open(file_path, 'w') as profile_file:
+        profile_file.write(json_data)
+
+
+@contextmanager
+def cprofile(file_path):
+
+    """
+    Runs the body of a with statement under cProfile and dumps the collected
+    statistics to a file, which can be read with pstats or snakeviz
+
+    args:
+        file_path: The path of the statistics file
+    """
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(file_path)
+
+
+if __name__ == "__main__":
+    pass
@@ -1,19 +1,38 @@
 # -*- coding: utf-8 -*-
 
-from filelock import FileLock, Timeout
 from shutil import rmtree
+from threading import Lock
+from filelock import Timeout
 import PrintTags as pt
 from os import path
-import json
 
+from .registry import JSONStore, SQLiteStore, JSON, SQLITE
 from .yaml_converter import YAMLConverter
 
 
 def singleton(cls):
-    obj = cls()
-    # Always return the same object
-    cls.__new__ = staticmethod(lambda cls: obj)
-    # Disable __init__
+
+    """
+    Makes every instantiation of cls return the same object. The object is
+    only created on first use, so that importing cls has no side effects
+    """
+
+    instances = []
+    lock = Lock()
+    init = cls.__init__
+
+    def __new__(klass):
+        # Always return the same object
+        if not instances:
+            with lock:
+                if not instances:
+                    obj = object.__new__(klass)
+                    init(obj)
+                    instances.append(obj)
+        return instances[0]
+
+    cls.__new__ = staticmethod(__new__)
+    # Disable __init__, it already ran when the object was created
     try:
         del cls.__init__
     except AttributeError:
@@ -29,20 +48,31 @@ class ProjectNotFoundError(Exception):
 class ProjectManager(object):
 
     """
-    Manages and creates ConPlex projects and their .conplex file
+    Manages and creates ConPlex projects and their .conplex file. Modules are
+    kept in a dict keyed by name, in the order they were added, so lookups and
+    deletes do not depend on the size of the project.
+    The project data is stored as JSON in the .conplex file, or in an SQLite
+    database in the .conplex.sqlite file if one exists, see migrate()
     """
 
     # TODO: Setup lock on project file
 
     __project_file_path = './.conplex'
+    __database_file_path = './.conplex.sqlite'
     __lock_file_path = './.conplex.lock'
 
     def __init__(self):
 
-        self.project_data = None
-        self.__lock = FileLock(self.__lock_file_path, timeout=1)
+        self.__active = None  # The name of the active module
+        self.__index = {}  # Maps each module name to its module dict. The module list of the project data is derived from it
+        self.__removed = []  # The names of the modules deleted since the project data was last stored
 
-        if path.isfile(self.__project_file_path):
+        if path.isfile(self.__database_file_path):
+            self.__store = SQLiteStore(self.__database_file_path)
+        else:
+            self.__store = JSONStore(self.__project_file_path, self.__lock_file_path)
+
+        if self.__store.exists():
             self.__load_project_file()
         else:
             self.__create_project_file()
@@ -53,22 +83,9 @@ class ProjectManager(object):
         Creates a new .conplex file in the current working directory
         """
 
-        project_data = {
-            'active': None,
-            'modules': []
-        }
-        try:
-            self.__lock.acquire(timeout=2)
-            with open(self.__project_file_path, 'w') as project_file:
-                json_data = json.dumps(self.project_data, indent=4, sort_keys=True)
-                project_file.write(json_data)
-        except Timeout as e:
-            pt.error(e)
-        except IOError as e:
-            pt.error(e)
-        finally:
-            self.__lock.release()
-            self.project_data = project_data
+        self.__active = None
+        self.__index = {}
+        self.__store.save(self.project_data)
 
     def __load_project_file(self):
 
@@ -78,34 +95,75 @@ class ProjectManager(object):
         """
 
         try:
-            self.__lock.acquire(timeout=2)
-            with open(self.__project_file_path, 'r') as project_file:
-                self.project_data = json.load(project_file)
-        except Timeout as e:
-            pt.error(e)
-        except IOError as e:
-            pt.error(e)
-        finally:
-            self.__lock.release()
+            self.project_data = self.__store.load()
+        except (Timeout, IOError, ValueError, KeyError, TypeError) as e:
+            raise ProjectNotFoundError('Could not load the ConPlex project from {}: {}'.format(self.__store.file_path, e)) from e
 
-    def update_project_file(self):
+    @property
+    def project_data(self):
+
+        """
+        Returns the project data as it is stored, with the modules in the
+        order they were added. The dict and its module list are built on each
+        access, so changes to them only take effect when the project data is
+        assigned back. Modules are kept in an index by name, which is the
+        only collection ProjectManager updates
+        """
+
+        return {'active': self.__active, 'modules': list(self.__index.values())}
+
+    @project_data.setter
+    def project_data(self, project_data):
+        index = {module['module_name']: module for module in project_data['modules']}
+        self.__removed.extend(name for name in self.__index if name not in index)
+        self.__active = project_data['active']
+        self.__index = index
+
+    def update_project_file(self, modules=None):
 
         """
         Writes the contents of the project_data attribute of this class
         to the .conplex file
+
+        args:
+            modules: The module dicts that changed. The SQLite store only writes the rows of these
+            modules. If this is None, it finds the changed modules itself
         """
 
-        try:
-            self.__lock.acquire(timeout=2)
-            with open(self.__project_file_path, 'w') as project_file:
-                json_data = json.dumps(self.project_data, indent=4, sort_keys=True)
-                project_file.write(json_data)
-        except Timeout as e:
-            pt.error(e)
-        except IOError as e:
-            pt.error(e)
-        finally:
-            self.__lock.release()
+        self.__store.save(self.project_data, modules=modules, removed=self.__removed)
+        self.__removed = []
+
+    @property
+    def storage(self):
+
+        """
+        Returns the name of the backend the project data is stored with, 'json' or 'sqlite'
+        """
+
+        return self.__store.name
+
+    def migrate(self, storage):
+
+        """
+        Moves the project data to another storage backend. The file of the
+        previous backend is removed once the new one has been written
+
+        args:
+            storage: (string) 'json' for the .conplex file or 'sqlite' for the .conplex.sqlite database
+        """
+
+        if storage == self.__store.name:
+            return
+        if storage == SQLITE:
+            store = SQLiteStore(self.__database_file_path)
+        elif storage == JSON:
+            store = JSONStore(self.__project_file_path, self.__lock_file_path)
+        else:
+            raise ValueError('Unknown storage backend: {}'.format(storage))
+        store.save(self.project_data)
+        self.__store.remove()
+        self.__store = store
+        self.__removed = []
 
     def set_active_module(self, module_name):
 
@@ -121,12 +179,11 @@ class ProjectManager(object):
             If module_name is None, the active module will be set to None/null
         """
         if module_name is None:
-            self.project_data['active'] = module_name
+            self.__active = module_name
+            return
+        if module_name in self.__index:
+            self.__active = module_name
             return
-        for module in self.project_data['modules']:
-            if module['module_name'] == module_name:
-                self.project_data['active'] = module_name
-                return
         raise ModuleNotFoundError('No module named {} found'.format(module_name))
 
     def create_module(self, options, set_active=False):
@@ -144,35 +201,121 @@ class ProjectManager(object):
             set_active: Whether or not this should be set as the active module
         """
 
-        generator = YAMLConverter(options['yaml_path'],
-                                  module_name=options['module_name'],
-                                  case_correction=options['case_correction'],
-                                  silent=True)
+        generator = YAMLConverter.from_module(options, silent=True)
         num_classes, num_variables = generator()
         options['num_classes'] = num_classes
         options['num_variables'] = num_variables
-        self.project_data['modules'].append(options)
+        options['fingerprint'] = generator.fingerprint
+        options['dependencies'] = generator.dependencies
+        self.__index[options['module_name']] = options
         if set_active:
             try:
                 self.set_active_module(options['module_name'])
             except ModuleNotFoundError as e:
                 pt.error(e)
 
+    def update_module(self, module):
+
+        """
+        Regenerates an existing module from its YAML file. The conversion is
+        skipped when the fingerprint stored for the module still matches its
+        YAML file and options. This method does not update the .conplex file,
+        so update_project() should be invoked after updating a module
+
+        args:
+            module: The module dict, as stored in the project data
+
+        returns: Whether or not the module was regenerated
+        """
+
+        generator = YAMLConverter.from_module(module, silent=True)
+        result = generator()
+        module['fingerprint'] = generator.fingerprint
+        module['dependencies'] = generator.dependencies
+        if result is None:
+            return False
+        module['num_classes'], module['num_variables'] = result
+        return True
+
+    def update_modules(self, module_names=None, workers=None, options=None, profile=False):
+
+        """
+        Regenerates several modules in parallel and writes the .conplex file
+        once all of them are done. A module that fails to convert does not
+        stop the others; its error is reported in its result instead
+
+        args:
+            module_names: The names of the modules to update. All modules are updated if this is None
+            workers: The number of worker processes. Defaults to the number of CPUs
+            options: A dict of module options, e.g. bytecode, that is stored for each updated module before converting it
+            profile: Whether or not to add the profile of each conversion to its result
+
+        returns: A list of result dicts in the order the modules finished, see conplex.core.batch.convert_module
+        """
+
+        from .batch import convert_modules
+
+        if module_names is None:
+            modules = list(self.__index.values())
+        else:
+            modules = []
+            for module_name in module_names:
+                module = self.get_module_by_name(module_name)
+                if module is None:
+                    raise ModuleNotFoundError('No module named {} found'.format(module_name))
+                modules.append(module)
+        if options:
+            for module in modules:
+                module.update(options)
+
+        results = []
+        for result in convert_modules(modules, workers=workers, profile=profile):
+            self.get_module_by_name(result['module_name']).update(result['values'])
+            results.append(result)
+        self.update_project_file(modules)
+        return results
+
     def delete_module(self, module):
 
         # TODO: Handle errors from rmtree
 
         rmtree(module['module_name'])
-        self.project_data['modules'].remove(module)
-        if self.project_data['active'] == module['module_name']:
+        if self.__index.get(module['module_name']) is module:
+            del self.__index[module['module_name']]
+            self.__removed.append(module['module_name'])
+        if self.__active == module['module_name']:
             self.set_active_module(None)
-        self.update_project_file()
+        self.update_project_file([])
 
     def get_module_by_name(self, name):
-        for module in self.project_data['modules']:
-            if module['module_name'] == name:
-                return module
-        return None
+        return self.__index.get(name)
+
+    def get_dependents(self, file_paths):
+
+        """
+        Returns the modules that need to be rebuilt when the given files
+        change, which are those whose YAML file is one of them or includes one
+        of them, directly or through other included files
+
+        args:
+            file_paths: A collection of file paths
+        """
+
+        file_paths = {path.abspath(file_path) for file_path in file_paths}
+        return [module for module in self.__index.values() if not file_paths.isdisjoint(self.get_inputs(module))]
+
+    @staticmethod
+    def get_inputs(module):
+
+        """
+        Returns the absolute paths of the YAML file of a module and of every
+        file it includes, as recorded by its last conversion
+
+        args:
+            module: The module dict, as stored in the project data
+        """
+
+        return [path.abspath(file_path) for file_path in [module['yaml_path']] + module.get('dependencies', [])]
 
     @property
     def modules(self):
@@ -181,7 +324,7 @@ class ProjectManager(object):
         Returns a list of all modules present in this project
         """
 
-        return self.project_data['modules']
+        return list(self.__index.values())
 
     @property
     def active_module(self):
@@ -190,7 +333,7 @@ class ProjectManager(object):
         Returns the active module for this project
         """
 
-        active_module = self.project_data['active']
+        active_module = self.__active
         if active_module is not None:
             return self.get_module_by_name(active_module)
 
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+"""
+Storage backends for the project registry. The JSON store keeps the
+.conplex file format ConPlex always used. The SQLite store keeps one row
+per module, so that updating a module is a single transactional row write
+no matter how many modules the project has.
+"""
+
+from filelock import FileLock, Timeout
+import PrintTags as pt
+from os import path, remove
+import json
+
+JSON = 'json'
+SQLITE = 'sqlite'
+
+
+class JSONStore(object):
+
+    """
+    Stores the project data as a pretty-printed JSON file
+
+    args:
+        file_path: The path of the .conplex file
+        lock_path: The path of the lock file guarding it
+    """
+
+    name = JSON
+
+    def __init__(self, file_path, lock_path):
+
+        self.__file_path = file_path
+        self.__lock = FileLock(lock_path, timeout=1)
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    def exists(self):
+        return path.isfile(self.__file_path)
+
+    def load(self):
+
+        """
+        Returns the project data stored in the file. Raises a filelock Timeout
+        if the file stays locked, an IOError if it can not be read, and a
+        ValueError if it is not valid JSON
+        """
+
+        self.__lock.acquire(timeout=2)
+        try:
+            with open(self.__file_path, 'r') as project_file:
+                return json.load(project_file)
+        finally:
+            self.__lock.release()
+
+    def save(self, project_data, modules=None, removed=()):
+
+        """
+        Writes the project data to the file. The JSON file can only be
+        rewritten as a whole, so modules and removed are ignored
+
+        args:
+            project_data: The project data dict
+            modules: The module dicts that changed since the last save
+            removed: The names of the modules removed since the last save
+        """
+
+        try:
+            self.__lock.acquire(timeout=2)
+            with open(self.__file_path, 'w') as project_file:
+                json_data = json.dumps(project_data, indent=4, sort_keys=True)
+                project_file.write(json_data)
+        except Timeout as e:
+            pt.error(e)
+        except IOError as e:
+            pt.error(e)
+        finally:
+            self.__lock.release()
+
+    def remove(self):
+        if self.exists():
+            remove(self.__file_path)
+
+    def close(self):
+        pass
+
+
+class SQLiteStore(object):
+
+    """
+    Stores the project data in an SQLite database with one row per module.
+    Saves only write the rows of modules that changed, in a single transaction
+
+    args:
+        file_path: The path of the database file
+    """
+
+    name = SQLITE
+
+    def __init__(self, file_path):
+
+        self.__file_path = file_path
+        self.__connection = None
+        self.__rows = {}  # Maps each module name to the JSON of its row as last loaded or saved
+        self.__active = None  # The active module as last loaded or saved
+
+    @property
+    def file_path(self):
+        return self.__file_path
+
+    def exists(self):
+        return path.isfile(self.__file_path)
+
+    def __connect(self):
+
+        """
+        Opens the database, creating its tables if needed, and returns the connection
+        """
+
+        if self.__connection is None:
+            import sqlite3  # Not every Python build ships with sqlite3, so it is only required by this store
+            self.__connection = sqlite3.connect(self.__file_path, timeout=2)
+            with self.__connection:
+                self.__connection.execute('CREATE TABLE IF NOT EXISTS modules (name TEXT PRIMARY KEY, data TEXT NOT NULL)')
+                self.__connection.execute('CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)')
+        return self.__connection
+
+    def load(self):
+
+        """
+        Returns the project data stored in the database. Modules are returned
+        in the order they were first added
+        """
+
+        connection = self.__connect()
+        self.__rows = {}
+        modules = []
+        for name, data in connection.execute('SELECT name, data FROM modules ORDER BY rowid'):
+            self.__rows[name] = data
+            modules.append(json.loads(data))
+        row = connection.execute("SELECT value FROM settings WHERE key = 'active'").fetchone()
+        self.__active = json.loads(row[0]) if row is not None else None
+        return {'active': self.__active, 'modules': modules}
+
+    def save(self, project_data, modules=None, removed=()):
+
+        """
+        Writes the rows of the modules that changed since the last save, drops
+        the rows of removed modules and stores the active module, all in one
+        transaction
+
+        args:
+            project_data: The project data dict
+            modules: The module dicts that changed since the last save. If this is None, every
+            module is compared against its stored row to find the changed and removed ones
+            removed: The names of the modules removed since the last save
+        """
+
+        connection = self.__connect()
+        rows = self.__rows
+        if modules is None:
+            modules = project_data['modules']
+            names = {module['module_name'] for module in modules}
+            removed = [name for name in rows if name not in names]
+
+        changed = []
+        for module in modules:
+            data = json.dumps(module, sort_keys=True)
+            if rows.get(module['module_name']) != data:
+                changed.append((module['module_name'], data))
+
+        with connection:
+            connection.executemany('INSERT INTO modules (name, data) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET data = excluded.data', changed)
+            connection.executemany('DELETE FROM modules WHERE name = ?', [(name,) for name in removed])
+            if project_data['active'] != self.__active:
+                connection.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('active', ?)", (json.dumps(project_data['active']),))
+
+        # Only remember what was written once the transaction is committed
+        rows.update(changed)
+        for name in removed:
+            rows.pop(name, None)
+        self.__active = project_data['active']
+
+    def remove(self):
+        self.close()
+        if self.exists():
+            remove(self.__file_path)
+
+    def close(self):
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+"""
+Rebuilds generated modules inside a running process. A reload converts the
+YAML file, builds fresh module objects for the generated package without
+touching the ones that are in use, and then swaps them into sys.modules in
+a single step, so that other threads either see the old or the new config.
+"""
+
+from importlib.machinery import SourceFileLoader, SourcelessFileLoader
+from importlib.util import spec_from_file_location, module_from_spec
+from os import path, listdir
+from threading import RLock
+import builtins
+import sys
+
+_lock = RLock()  # Serializes reloads, and the registration of callbacks
+_callbacks = []  # Pairs of module names, or None for all modules, and callbacks
+
+
+def on_reload(callback, module_name=None):
+
+    """
+    Registers a function that is called as callback(module_name, module)
+    after a module has been swapped in. Returns the callback, so this can
+    be used as a decorator
+
+    args:
+        callback: The function to call
+        module_name: Only call the function for this module. It is called for all modules if this is None
+    """
+
+    with _lock:
+        _callbacks.append((module_name, callback))
+    return callback
+
+
+def remove_reload_callback(callback):
+
+    """
+    Unregisters a function registered with on_reload
+    """
+
+    with _lock:
+        _callbacks[:] = [entry for entry in _callbacks if entry[1] is not callback]
+
+
+def _find_sources(package_dir):
+
+    """
+    Maps the name of each module in a generated package directory to the
+    path of its source, or of its bytecode for sourceless packages
+    """
+
+    sources = {}
+    for file_name in sorted(listdir(package_dir)):
+        name, extension = path.splitext(file_name)
+        if extension == '.py' or (extension == '.pyc' and name not in sources):
+            sources[name] = path.join(package_dir, file_name)
+    return sources
+
+
+def build_package(import_name, package_dir):
+
+    """
+    Builds new module objects for a generated package and all of its
+    submodules, without importing them through sys.modules. Imports between
+    the generated modules are resolved to the new module objects
+
+    args:
+        import_name: The name the package is imported as
+        package_dir: The directory of the generated package
+
+    returns: A dict mapping the full name of each module to the module
+    """
+
+    sources = _find_sources(package_dir)
+    if '__init__' not in sources:
+        raise ImportError('No generated package found in {}'.format(package_dir), name=import_name)
+
+    staged = {}  # Maps each full module name to its module, code and whether it has been executed
+    for name, source_path in sources.items():
+        full_name = import_name if name == '__init__' else '{}.{}'.format(import_name, name)
+        loader_class = SourceFileLoader if source_path.endswith('.py') else SourcelessFileLoader
+        loader = loader_class(full_name, source_path)
+        if name == '__init__':
+            spec = spec_from_file_location(full_name, source_path, loader=loader, submodule_search_locations=[package_dir])
+        else:
+            spec = spec_from_file_location(full_name, source_path, loader=loader)
+        staged[full_name] = [module_from_spec(spec), loader.get_code(full_name), False]
+    return execute_package(import_name, staged)
+
+
+def execute_package(import_name, staged):
+
+    """
+    Executes the modules of a package that is not imported through
+    sys.modules. Imports between the modules are resolved to each other
+
+    args:
+        import_name: The name the package is imported as
+        staged: A dict mapping the full name of each module to a list of the module, its code, and whether
+        it has already been executed. The code of executed modules is not run again
+
+    returns: A dict mapping the full name of each module to the module
+    """
+
+    def execute(full_name):
+        entry = staged[full_name]
+        if not entry[2]:
+            entry[2] = True
+            exec(entry[1], entry[0].__dict__)
+        return entry[0]
+
+    def staged_import(name, globals=None, locals=None, fromlist=(), level=0):
+        # Relative imports inside the package resolve to the staged modules
+        if level > 0 and globals is not None:
+            package = globals.get('__package__') or ''
+            full_name = '{}.{}'.format(package, name) if name else package
+            if full_name in staged:
+                return execute(full_name) if fromlist else execute(import_name)
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    namespace = dict(builtins.__dict__)
+    namespace['__import__'] = staged_import
+    for entry in staged.values():
+        entry[0].__builtins__ = namespace
+
+    package = staged[import_name][0]
+    for full_name in staged:
+        execute(full_name)
+        if full_name != import_name:
+            setattr(package, full_name.rsplit('.', 1)[1], staged[full_name][0])
+    return {full_name: entry[0] for full_name, entry in staged.items()}
+
+
+def swap_package(import_name, package_dir):
+
+    """
+    Builds a generated package with build_package and swaps the new modules
+    into sys.modules at once. Submodules that no longer exist are removed
+    afterwards, and the registered callbacks are notified
+
+    args:
+        import_name: The name the package is imported as
+        package_dir: The directory of the generated package
+
+    returns: The new package module
+    """
+
+    with _lock:
+        modules = build_package(import_name, package_dir)
+        stale = [name for name in sys.modules if name.startswith(import_name + '.') and name not in modules]
+        sys.modules.update(modules)  # A single update, so other threads never see a mix of old and new modules
+        for name in stale:
+            sys.modules.pop(name, None)
+        package = modules[import_name]
+        if '.' in import_name:
+            parent_name, _, child_name = import_name.rpartition('.')
+            parent = sys.modules.get(parent_name)
+            if parent is not None:
+                setattr(parent, child_name, package)
+        callbacks = [callback for module_name, callback in _callbacks if module_name in (None, import_name)]
+
+    for callback in callbacks:
+        callback(import_name, package)
+    return package
+
+
+def reload(module_name, import_name=None, yaml_path=None, **options):
+
+    """
+    Converts the YAML file of a module and swaps the rebuilt module into the
+    running process. Modules registered in the .conplex file are converted
+    with their stored options. Other modules need the path to their YAML file
+
+    args:
+        module_name: The name of the module
+        import_name: The name the module is imported as. Defaults to module_name
+        yaml_path: The path to the YAML file of an unregistered module
+        options: Additional YAMLConverter arguments for an unregistered module, e.g. output_dir
+
+    returns: The new module
+    """
+
+    from .yaml_converter import YAMLConverter
+    from .errors import ConversionError
+
+    manager = None
+    if yaml_path is None:
+        from .project_manager import ProjectManager
+        manager = ProjectManager()
+        module = manager.get_module_by_name(module_name)
+        if module is None:
+            raise ModuleNotFoundError('No module named {} found'.format(module_name))
+        converter = YAMLConverter.from_module(module, silent=True, raise_errors=True)
+    else:
+        module = None
+        converter = YAMLConverter(yaml_path, module_name=module_name, silent=True, raise_errors=True, **options)
+
+    try:
+        counts = converter()
+    except ConversionError as e:
+        raise ImportError('Could not convert the YAML file of {}'.format(module_name), name=module_name) from e
+
+    if manager is not None and counts is not None:
+        module['fingerprint'] = converter.fingerprint
+        module['dependencies'] = converter.dependencies
+        module['num_classes'], module['num_variables'] = counts
+        manager.update_project_file([module])
+
+    return swap_package(import_name or module_name, converter.output_path)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+Converts multi-document YAML streams, such as one file holding a document
+per environment, into one module per document. The stream is read once and
+parsed in a single pass, and each document is converted as soon as it has
+been parsed, so only one document is held in memory at a time.
+"""
+
+from os import path
+from time import perf_counter
+import sys
+
+from .errors import YAMLNotFoundError, YAMLParseError
+from .tree import package_name
+from .yaml_converter import YAMLConverter
+
+STDIN = '-'  # The yaml_path that reads the stream from standard input
+
+
+def read_stream(yaml_path):
+
+    """
+    Returns the raw bytes of a YAML stream
+
+    args:
+        yaml_path: (string) The path of the YAML file, or '-' for standard input
+    """
+
+    if yaml_path == STDIN:
+        return sys.stdin.buffer.read()
+    try:
+        with open(yaml_path, 'rb') as yaml_file:
+            return yaml_file.read()
+    except IOError as e:
+        raise YAMLNotFoundError('Could not load YAML file', yaml_path=yaml_path) from e
+
+
+def document_name(document, index, name_key=None, prefix='config'):
+
+    """
+    Returns the module name of a document in a stream
+
+    args:
+        document: The parsed document
+        index: (int) The position of the document in the stream, starting at 0
+        name_key: (string) A top level key whose value names the module. Documents without it are named by index
+        prefix: (string) The prefix of the names of documents named by index
+    """
+
+    if name_key is not None and isinstance(document, dict) and document.get(name_key) is not None:
+        return package_name(str(document[name_key]))
+    return '{}_{}'.format(prefix, index)
+
+
+def convert_stream(yaml_path, output_dir=None, name_key=None, prefix=None, loader='auto', **options):
+
+    """
+    Converts every document of a YAML stream into its own module. A
+    ConversionError is raised if the stream can not be read or parsed, in
+    which case the modules of the documents before the error have already
+    been written. Unlike registered modules and trees, streams keep no
+    fingerprints, so every document is converted again on each call and
+    its result is always marked as updated
+
+    args:
+        yaml_path: (string) The path of the YAML file, or '-' for standard input
+        output_dir: (string) The directory the modules are placed in. Defaults to the directory of the
+        YAML file, or the working directory for standard input
+        name_key: (string) A top level key whose value names the module of each document, e.g. environment
+        prefix: (string) The prefix of the names of documents named by index. Defaults to the YAML file name, or config
+        loader: (string) The YAML loader backend, see conplex.core.loader.get_loader
+        options: YAMLConverter arguments applied to every document, e.g. case_correction or split
+
+    returns: A list of result dicts in the order of the documents, see conplex.core.batch.convert_module
+    """
+
+    from .loader import get_loader, load_all
+
+    if yaml_path == STDIN:
+        file_path = path.join('.', 'stdin.yaml')  # Includes are resolved against the working directory
+        prefix = prefix or 'config'
+    else:
+        file_path = yaml_path
+        prefix = prefix or package_name(path.basename(yaml_path).split('.')[0])
+    if output_dir is None:
+        output_dir = path.dirname(file_path)
+    output_dir = path.join(output_dir, '')  # The converter expects a trailing separator
+
+    source = read_stream(yaml_path)
+    loader_class, _ = get_loader(loader)
+
+    results = []
+    names = set()
+    documents = load_all(source, loader_class, file_path)
+    index = 0
+    while True:
+        start = perf_counter()
+        try:
+            document, includes = next(documents)
+        except StopIteration:
+            break
+        except Exception as e:
+            raise YAMLParseError('Could not parse document {} of the YAML stream'.format(index), yaml_path=yaml_path) from e
+        if document is None:  # An empty document, e.g. after a trailing ---
+            index += 1
+            continue
+        if not isinstance(document, dict):
+            raise YAMLParseError('Document {} of the YAML stream is not a mapping'.format(index), yaml_path=yaml_path)
+
+        module_name = document_name(document, index, name_key=name_key, prefix=prefix)
+        if module_name in names:
+            raise ValueError('More than one document of {} would generate {}'.format(yaml_path, module_name))
+        names.add(module_name)
+
+        converter = YAMLConverter(file_path,
+                                  output_dir=output_dir,
+                                  module_name=module_name,
+                                  silent=True,
+                                  raise_errors=True,
+                                  source=source,
+                                  data=document,
+                                  includes=includes,
+                                  **options)
+        counts = converter()
+        results.append({
+            'module_name': module_name,
+            'yaml_path': yaml_path,
+            'updated': True,
+            'error': None,
+            'seconds': perf_counter() - start,
+            'values': {'fingerprint': converter.fingerprint,
+                       'dependencies': converter.dependencies,
+                       'num_classes': counts[0],
+                       'num_variables': counts[1],
+                       'document': index}
+        })
+        index += 1
+    return results
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+"""
+Converts a directory tree of YAML files into a mirrored package hierarchy.
+Every YAML file becomes a generated module, every directory becomes a
+package whose init file imports its children lazily, and the files are
+converted concurrently on a process pool. The fingerprint of each file is
+kept in a manifest at the root of the output, so unchanged files are skipped.
+"""
+
+from os import path, walk, makedirs, replace, remove, getpid
+from shutil import rmtree
+import keyword
+import json
+import re
+
+from .batch import convert_modules
+from .emitter import CodeEmitter
+
+MANIFEST_NAME = '.conplex-tree'  # Maps each converted YAML file, relative to the source directory, to its fingerprint and dependencies
+
+_invalid_characters = re.compile(r'\W')
+
+PACKAGE_INIT = '''from importlib import import_module
+
+__all__ = {names!r}
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError('module {{!r}} has no attribute {{!r}}'.format(__name__, name))
+    return import_module('.' + name, __name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+'''
+
+
+def package_name(name):
+
+    """
+    Turns a file or directory name into a valid Python package name
+
+    args:
+        name: The name, without extension
+    """
+
+    name = _invalid_characters.sub('_', name.replace(' ', '_'))
+    if not name or name[0].isdigit() or keyword.iskeyword(name):
+        name = '_' + name
+    return name
+
+
+def find_yaml_files(source_dir):
+
+    """
+    Returns the paths of all YAML files in a directory tree, relative to the
+    directory. Hidden directories and __pycache__ are skipped
+    """
+
+    yaml_paths = []
+    for directory, directory_names, file_names in walk(source_dir):
+        directory_names[:] = sorted(name for name in directory_names if not name.startswith('.') and name != '__pycache__')
+        for file_name in sorted(file_names):
+            if file_name.endswith('.yaml') and not file_name.startswith('.'):
+                yaml_paths.append(path.relpath(path.join(directory, file_name), source_dir))
+    return yaml_paths
+
+
+def _package_path(relative_path):
+    # The package names leading to the module generated from a YAML file
+    parts = relative_path.split(path.sep)
+    return [package_name(part) for part in parts[:-1]] + [package_name(parts[-1][:-len('.yaml')])]
+
+
+def _write_if_changed(file_path, emitter):
+
+    """
+    Writes the emitted content to a file, unless the file already holds it.
+    The file is replaced atomically
+    """
+
+    if emitter.matches(file_path):
+        return False
+    staging_path = '{}.{}.tmp'.format(file_path, getpid())
+    try:
+        with open(staging_path, 'w') as staging_file:
+            emitter.write_to(staging_file)
+        replace(staging_path, file_path)
+    finally:
+        if path.isfile(staging_path):
+            remove(staging_path)
+    return True
+
+
+def convert_tree(source_dir, output_dir=None, workers=None, profile=False, **options):
+
+    """
+    Converts every YAML file in a directory tree. A file at services/billing.yaml
+    becomes the module services.billing of the package in output_dir, and
+    services gets an init file that imports billing and its other children on
+    first access. Modules that were generated from YAML files that no longer
+    exist are removed
+
+    args:
+        source_dir: (string) The directory holding the YAML files
+        output_dir: (string) The root directory of the generated package. Defaults to source_dir,
+        so the modules are placed next to their YAML files, as for single files
+        workers: (int) The number of worker processes. Defaults to the number of CPUs
+        profile: (bool) Whether or not to add the profile of each conversion to its result
+        options: Module options applied to every file, as stored for registered modules, e.g. case_correction or split
+
+    returns: A list of result dicts, see conplex.core.batch.convert_module, with the
+    yaml_path of each result relative to source_dir
+    """
+
+    if output_dir is None:
+        output_dir = source_dir
+    manifest_path = path.join(output_dir, MANIFEST_NAME)
+    manifest = {}
+    if path.isfile(manifest_path):
+        with open(manifest_path, 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+
+    yaml_paths = find_yaml_files(source_dir)
+    packages = {(): set()}  # Maps the path of each package to the names of its children
+    module_paths = {}
+    for relative_path in yaml_paths:
+        parts = tuple(_package_path(relative_path))
+        if parts in module_paths:
+            raise ValueError('{} and {} would both generate {}'.format(module_paths[parts], relative_path, '.'.join(parts)))
+        module_paths[parts] = relative_path
+        for i in range(len(parts)):
+            packages.setdefault(parts[:i], set()).add(parts[i])
+    for parts in module_paths:
+        if parts in packages:
+            raise ValueError('{} would generate {}, which is also a directory package'.format(module_paths[parts], '.'.join(parts)))
+
+    modules = []
+    for parts, relative_path in module_paths.items():
+        module = {'case_correction': False}
+        module.update(options)
+        module.update(manifest.get(relative_path, {}))  # The fingerprint covers the options, so changing them still rebuilds the module
+        module['module_name'] = parts[-1]
+        module['yaml_path'] = path.join(source_dir, relative_path)
+        module['output_dir'] = path.join(output_dir, *parts[:-1]) + '/'
+        modules.append(module)
+
+    for package in packages:
+        package_dir = path.join(output_dir, *package)
+        if not path.isdir(package_dir):
+            makedirs(package_dir)
+
+    results = []
+    new_manifest = {}
+    for result in convert_modules(modules, workers=workers, profile=profile):
+        relative_path = path.relpath(result['yaml_path'], source_dir)
+        result['yaml_path'] = relative_path
+        results.append(result)
+        if result['error'] is None:
+            new_manifest[relative_path] = {'fingerprint': result['values']['fingerprint'],
+                                           'dependencies': result['values']['dependencies']}
+        elif relative_path in manifest:
+            new_manifest[relative_path] = manifest[relative_path]
+
+    for package, names in packages.items():
+        init = CodeEmitter('# -*- coding: utf-8 -*-\n\n')
+        init.write(PACKAGE_INIT.format(names=sorted(names)))
+        _write_if_changed(path.join(output_dir, *package, '__init__.py'), init)
+
+    for relative_path in manifest:
+        if relative_path not in new_manifest and not path.isfile(path.join(source_dir, relative_path)):
+            module_dir = path.join(output_dir, *_package_path(relative_path))
+            if path.isdir(module_dir):
+                rmtree(module_dir)
+
+    with open(manifest_path, 'w') as manifest_file:
+        json.dump(new_manifest, manifest_file, indent=4, sort_keys=True)
+    return results
+
+
+if __name__ == "__main__":
+    pass
@@ -1,6 +1,36 @@
 # -*- coding: utf-8 -*-
 
-from re import sub, findall, compile, IGNORECASE
+from re import compile, IGNORECASE
+from functools import lru_cache
+from hashlib import sha256
+import json
+
+CASE_CACHE_SIZE = 8192  # The number of translated names each case correction function remembers
+
+_whitespace = compile(r'\s+')
+_acronym = compile(r'\b[A-Z]*[A-Z]\b\.?')
+_word_boundary = compile(r'(?<=[a-z0-9])(?=[A-Z])')
+_separators = compile(r'[\W_]+')
+
+
+class FlaggedDict(dict):
+
+    """
+    A dictionary that was tagged with !dict in the YAML file. Like keys
+    carrying the !dict suffix, it is written as a dict instead of a class
+    """
+
+    pass
+
+
+def is_class(key, value):
+
+    """
+    Checks if a key and its value are written as a class. This is the case
+    for nested mappings, unless they carry the !dict flag
+    """
+
+    return isinstance(value, dict) and not isinstance(value, FlaggedDict) and '!dict' not in key
 
 
 def sort_dict_last(x):
@@ -16,7 +46,7 @@ def sort_dict_last(x):
     dicts = {}
     other = {}
     for key, value in x.items():
-        if isinstance(value, dict) and '!dict' not in key:
+        if is_class(key, value):
             dicts[key] = value
         else:
             other[key] = value
@@ -24,28 +54,92 @@ def sort_dict_last(x):
     return other
 
 
+def fingerprint(source, dependencies=(), **options):
+
+    """
+    Computes a fingerprint for a conversion. The fingerprint covers the raw
+    bytes of the YAML source and of every file it includes, the converter
+    options that affect the generated output, and the ConPlex version, so
+    any change to one of them produces a new fingerprint
+
+    args:
+        source: (bytes) The raw content of the YAML configuration file
+        dependencies: A sequence of (path, bytes) pairs for the included files. The bytes are None for missing files
+        options: The converter options that affect the generated module
+    """
+
+    from conplex import __version__
+
+    digest = sha256()
+    digest.update(__version__.encode('utf-8'))
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+    digest.update(source)
+    for dependency_path, dependency_source in dependencies:
+        if dependency_source is None:
+            digest.update('\n{}:missing'.format(dependency_path).encode('utf-8'))
+        else:
+            digest.update('\n{}:{}\n'.format(dependency_path, len(dependency_source)).encode('utf-8'))
+            digest.update(dependency_source)
+    return digest.hexdigest()
+
+
+def array_typecode(values):
+
+    """
+    Returns the typecode of the smallest array type that can hold all of the
+    values, or None if they are not either all ints or all floats. Bools do
+    not count as ints
+
+    args:
+        values: (list) The values
+    """
+
+    if not values:
+        return None
+    value_type = type(values[0])
+    if value_type is float:
+        return 'd' if all(type(value) is float for value in values) else None
+    if value_type is not int or not all(type(value) is int for value in values):
+        return None
+    low, high = min(values), max(values)
+    for typecode, bits in (('b', 8), ('h', 16), ('i', 32), ('q', 64)):
+        if -2 ** (bits - 1) <= low and high < 2 ** (bits - 1):
+            return typecode
+    return None
+
+
 def find_acronyms(x):
-    return findall(r'\b[A-Z]*[A-Z]\b\.?', x)
+    return _acronym.findall(x)
+
+
+@lru_cache(maxsize=256)
+def _acronym_pattern(acronym):
+    return compile(acronym, IGNORECASE)
 
 
+@lru_cache(maxsize=CASE_CACHE_SIZE)
 def upper_camel_case(x):
 
+    """
+    Converts a string to upper camel case, keeping acronyms capitalized.
+    Results are cached, as configuration keys tend to repeat
+    """
+
     acronyms = find_acronyms(x)
-    x = sub('\s+', '_', x)
+    x = _whitespace.sub('_', x)
     x = x.replace('_', ' ')
-    x = [word[0].capitalize() + word[1:] for word in x.split(' ')]
-    x = ' '.join(x)
-    x = x.replace(' ', '')
+    x = ''.join([word[0].capitalize() + word[1:] for word in x.split(' ')])
     for acronym in acronyms:
-        pattern = compile(acronym, IGNORECASE)
-        x = pattern.sub(acronym, x)
+        x = _acronym_pattern(acronym).sub(acronym, x)
     return x
 
 
+@lru_cache(maxsize=CASE_CACHE_SIZE)
 def snake_case(x):
 
     """
-    Converts a string to snake case
+    Converts a string to snake case. Results are cached, as configuration
+    keys tend to repeat
     """
 
     # Disclaimer: This method is annoyingly complex, and i'm sure there is a much better way to do this. 
@@ -70,8 +164,8 @@ def snake_case(x):
     # it is possible that islower() will return False because the character before it is an underscore. This means
     # We have to handle both possibilities.
 
-    x = sub('\s+', '_', x)  # First, we go ahead and replace any consecutive spaces with underscores
-    out = ''
+    x = _whitespace.sub('_', x)  # First, we go ahead and replace any consecutive spaces with underscores
+    out = []
     for i, char in enumerate(x):
         if char.isupper():
             # Get the next and previous characters for later use
@@ -79,30 +173,71 @@ def snake_case(x):
             previous_char = x[i - 1]
             if not i == 0:  # Check if we are not at the first character
                 if previous_char.islower():
-                    out += '_'
+                    out.append('_')
                     if next_char.islower() or next_char == '_':
-                        out += char.lower()
+                        out.append(char.lower())
                         continue
                 elif previous_char == '_':
                     if next_char.islower() or next_char == '_':
-                        out += char.lower()
+                        out.append(char.lower())
                         continue
             elif next_char.isupper():
-                out += char
+                out.append(char)
                 continue
             else:
-                out += char.lower()
+                out.append(char.lower())
                 continue
         elif not char == '_' and x[i - 1].isupper() and x[i - 2].isupper():  # This could be a lowercased word following an acronym without any spaces
-            out += '_'  # We will insert an underscore to break this character into its own word
+            out.append('_')  # We will insert an underscore to break this character into its own word
         elif char == '_' and x[i - 1] == '_':
             continue
-        out += char
+        out.append(char)
 
+    out = ''.join(out)
     if out.endswith('_'):
         out = out[:len(out) - 1]
     return out
 
 
+@lru_cache(maxsize=CASE_CACHE_SIZE)
+def constant_case(x):
+
+    """
+    Converts a name to upper case constant style, e.g. pageName to
+    PAGE_NAME. Runs of separators become a single underscore, so that
+    double underscores are free to separate the parts of a flattened name
+    """
+
+    x = _word_boundary.sub('_', x)
+    x = _separators.sub('_', x)
+    return x.strip('_').upper()
+
+
+def translate_keys(mapping, case_correction=False):
+
+    """
+    Translates all keys of a mapping into the Python names they are written
+    as. The !dict flag is removed from each key. Keys of nested mappings
+    become class names, all other keys become variable or attribute names
+
+    args:
+        mapping: A dict parsed from the YAML file
+        case_correction: Whether or not names should be altered to fit standard Python conventions
+
+    returns: A dict mapping each key to its Python name
+    """
+
+    names = {}
+    for key, value in mapping.items():
+        name = key.replace('!dict', '')
+        if not case_correction:
+            names[key] = name.replace(' ', '_')
+        elif is_class(key, value):
+            names[key] = upper_camel_case(name)
+        else:
+            names[key] = snake_case(name)
+    return names
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+from os import path, read, close, stat, O_CLOEXEC
+from time import sleep, monotonic
+import select
+import struct
+import sys
+
+from .batch import convert_module
+
+# inotify event masks, see inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_inotify_event = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def _load_libc():
+
+    """
+    Returns the C library if it provides inotify, otherwise None
+    """
+
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (ImportError, OSError, AttributeError):
+        return None
+    return libc
+
+
+class InotifyBackend(object):
+
+    """
+    Waits for changes to a set of files with inotify. The directories holding
+    the files are watched rather than the files themselves, so that editors
+    which save by writing a new file and renaming it over the old one are seen
+
+    args:
+        file_paths: The absolute paths of the files to watch
+    """
+
+    name = 'inotify'
+
+    def __init__(self, file_paths):
+
+        import ctypes
+
+        libc = _load_libc()
+        if libc is None:
+            raise OSError('inotify is not available on this system')
+        self.__file_paths = set(file_paths)
+        self.__directories = {}  # Maps watch descriptors to the watched directory
+        self.__fd = libc.inotify_init1(O_CLOEXEC)
+        if self.__fd < 0:
+            raise OSError(ctypes.get_errno(), 'Could not initialize inotify')
+        for directory in {path.dirname(file_path) for file_path in self.__file_paths}:
+            wd = libc.inotify_add_watch(self.__fd, directory.encode(), IN_WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                close(self.__fd)
+                raise OSError(error, 'Could not watch {}'.format(directory))
+            self.__directories[wd] = directory
+
+    def wait(self, timeout=None):
+
+        """
+        Blocks until one of the watched files changes or the timeout in seconds
+        expires, and returns the set of changed file paths
+        """
+
+        changed = set()
+        deadline = None if timeout is None else monotonic() + timeout
+        while not changed:
+            remaining = None if deadline is None else max(0.0, deadline - monotonic())
+            if not select.select([self.__fd], [], [], remaining)[0]:
+                break
+            data = read(self.__fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = _inotify_event.unpack_from(data, offset)
+                offset += _inotify_event.size
+                name = data[offset:offset + length].rstrip(b'\0').decode()
+                offset += length
+                file_path = path.join(self.__directories.get(wd, ''), name)
+                if file_path in self.__file_paths:
+                    changed.add(file_path)
+        return changed
+
+    def close(self):
+        close(self.__fd)
+
+
+class PollingBackend(object):
+
+    """
+    Waits for changes to a set of files by comparing their modification
+    time, size and inode at a fixed interval
+
+    args:
+        file_paths: The absolute paths of the files to watch
+        interval: The number of seconds between two polls
+    """
+
+    name = 'polling'
+
+    def __init__(self, file_paths, interval=0.5):
+
+        self.__interval = interval
+        self.__stats = {file_path: self.__stat(file_path) for file_path in file_paths}
+
+    @staticmethod
+    def __stat(file_path):
+        try:
+            result = stat(file_path)
+        except OSError:
+            return None
+        return result.st_mtime_ns, result.st_size, result.st_ino
+
+    def wait(self, timeout=None):
+
+        """
+        Blocks until one of the watched files changes or the timeout in seconds
+        expires, and returns the set of changed file paths
+        """
+
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            changed = set()
+            for file_path, previous in self.__stats.items():
+                current = self.__stat(file_path)
+                if current != previous:
+                    self.__stats[file_path] = current
+                    changed.add(file_path)
+            if changed:
+                return changed
+            if deadline is None:
+                sleep(self.__interval)
+            else:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    return changed
+                sleep(min(self.__interval, remaining))
+
+    def close(self):
+        pass
+
+
+class Watcher(object):
+
+    """
+    Watches the YAML files of every module registered in the project, along
+    with the files they include, and regenerates a module in the current
+    process when one of its inputs changes. Bursts of changes are debounced,
+    and only the modules whose inputs changed are converted
+
+    args:
+        manager: The project manager holding the modules to watch
+        debounce: (float) The number of seconds without further changes before a rebuild starts
+        poll_interval: (float) The number of seconds between two polls when inotify is not used
+        use_inotify: (bool) Whether or not to use inotify when it is available
+        callback: A function that is called with the result dict of every module conversion
+    """
+
+    def __init__(self, manager, debounce=0.2, poll_interval=0.5, use_inotify=True, callback=None):
+
+        self.__manager = manager
+        self.__debounce = debounce
+        self.__poll_interval = poll_interval
+        self.__use_inotify = use_inotify
+        self.__callback = callback
+        self.__running = False
+        self.__file_paths = None  # This will become the set of watched files
+        self.__backend = None
+        self.__watch_inputs()
+
+    def __watch_inputs(self):
+
+        """
+        Starts watching the inputs of all modules, unless they are already
+        watched. The inputs change when a rebuilt module includes other files
+        """
+
+        file_paths = set()
+        for module in self.__manager.modules:
+            file_paths.update(self.__manager.get_inputs(module))
+        if file_paths == self.__file_paths:
+            return
+        if self.__backend is not None:
+            self.__backend.close()
+        backend = None
+        if self.__use_inotify and _load_libc() is not None:
+            try:
+                backend = InotifyBackend(file_paths)
+            except OSError:
+                backend = None
+        if backend is None:
+            backend = PollingBackend(file_paths, interval=self.__poll_interval)
+        self.__backend = backend
+        self.__file_paths = file_paths
+
+    @property
+    def backend(self):
+
+        """
+        Returns the name of the backend used to detect changes
+        """
+
+        return self.__backend.name
+
+    def run(self):
+
+        """
+        Watches for changes until stop() is called
+        """
+
+        self.__running = True
+        try:
+            while self.__running:
+                changed = self.__backend.wait(timeout=1.0)
+                if not changed:
+                    continue
+                # Keep collecting changes until the files have been quiet for the debounce period
+                while True:
+                    more = self.__backend.wait(timeout=self.__debounce)
+                    if not more:
+                        break
+                    changed |= more
+                self.rebuild(changed)
+        finally:
+            self.__backend.close()
+
+    def stop(self):
+        self.__running = False
+
+    def rebuild(self, changed):
+
+        """
+        Regenerates the modules whose YAML file or included files are in
+        changed, and writes the .conplex file if any of them was converted
+
+        args:
+            changed: A set of absolute file paths
+
+        returns: A list of result dicts, see conplex.core.batch.convert_module
+        """
+
+        manager = self.__manager
+        results = []
+        modules = manager.get_dependents(changed)
+        for module in modules:
+            result = convert_module(module)
+            module.update(result['values'])
+            results.append(result)
+            if self.__callback is not None:
+                self.__callback(result)
+        if results:
+            manager.update_project_file(modules)
+            self.__watch_inputs()
+        return results
+
+
+if __name__ == "__main__":
+    pass
@@ -1,9 +1,115 @@
 # -*- coding: utf-8 -*-
 
-from os import path, makedirs
-from conplex.core.utils import upper_camel_case, snake_case, sort_dict_last
+from os import path, makedirs, remove, replace
+from conplex.core.utils import sort_dict_last, translate_keys, is_class, constant_case, fingerprint, array_typecode
+from conplex.core.emitter import CodeEmitter, ByteEmitter
+from conplex.core.errors import ConversionError, YAMLNotFoundError, YAMLParseError, OutputError, CompileError
+from conplex.core.overlay import STRATEGIES
 import PrintTags as pt
-from sys import exit
+from sys import exit, implementation
+from time import perf_counter
+
+HEADER = '# -*- coding: utf-8 -*-\n\n'
+SHARED_MIN_LENGTH = 16  # Repeated scalars with shorter source than this are not worth deduplicating
+
+LAZY_INIT = '''
+def __getattr__(name):
+    try:
+        submodule = _submodules[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name)) from None
+    value = getattr(import_module(submodule, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+'''
+
+ARRAYS_MODULE = '''from os import path
+import sys
+
+ARRAY_TYPE = {array_type!r}
+_buffer = None
+_views = {{}}  # Read-only views are shared by every use of the same stored list
+
+
+def _load_buffer():
+    # The sidecar file is mapped on first use, and the arrays are views of the mapping
+    global _buffer
+    if _buffer is None:
+        import mmap
+        with open(path.join(path.dirname(__file__), '_arrays.bin'), 'rb') as arrays_file:
+            _buffer = memoryview(mmap.mmap(arrays_file.fileno(), 0, access=mmap.ACCESS_READ))
+    return _buffer
+
+
+def load_array(offset, size, typecode):
+    if ARRAY_TYPE == 'memoryview' and sys.byteorder == 'little':
+        if offset not in _views:
+            _views[offset] = _load_buffer()[offset:offset + size].cast(typecode)
+        return _views[offset]
+    data = _load_buffer()[offset:offset + size]
+    from array import array
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()  # The sidecar file is little endian
+    return values
+
+
+class LazyArray(object):
+
+    def __init__(self, offset, size, typecode):
+        self.__arguments = offset, size, typecode
+        self.__name = None
+
+    def __set_name__(self, owner, name):
+        self.__name = name
+
+    def __get__(self, instance, owner):
+        value = load_array(*self.__arguments)
+        setattr(owner, self.__name, value)  # Later reads find the array itself
+        return value
+'''
+INDEX_HELPERS = '''
+from bisect import bisect_left  # Imported after INDEX is built, so configuration names can not shadow the helpers
+
+PATHS = list(INDEX)  # Sorted, so the paths under a prefix are next to each other
+
+
+def get(path, default=None):
+    return INDEX.get(path, default)
+
+
+def scan(prefix=''):
+    # Returns the paths at or below a prefix, e.g. 'Page_size.pageName', mapped to their values, in order
+    if not prefix:
+        return dict(INDEX)
+    found = {}
+    boundary = prefix + '.'
+    for i in range(bisect_left(PATHS, prefix), len(PATHS)):
+        path = PATHS[i]
+        if not path.startswith(prefix):
+            break
+        if path == prefix or path.startswith(boundary):
+            found[path] = INDEX[path]
+    return found
+'''
+INDEX_INIT = '''
+
+
+def __getattr__(name):
+    # The index refers to every value, which would load stored arrays, so it is only imported on first use
+    if name in {names!r}:
+        from ._index import {imports}
+        globals().update({updates})
+        return globals()[name]
+    raise AttributeError('module {{!r}} has no attribute {{!r}}'.format(__name__, name))
+'''
+INDEX_NAMES = ('get', 'scan')  # The helpers of the index that the init file exposes, unless the configuration uses their names
+ARRAY_ALIGNMENT = 8  # Arrays in the sidecar file start at multiples of this many bytes
 
 
 class YAMLConverter(object):
@@ -20,19 +126,43 @@ class YAMLConverter(object):
         case_correction (experimental): (bool) Whether or not variable, attribute, and class names should be altered to fit standard Python conventions
         verbose: (bool) Whether or not to print additional information, including error descriptions
         silent: (bool) Silences all prints and outputs. This is useful when running ConPlex from inside a script or application to update the config at runtime
+        fingerprint: (string) The fingerprint of the previous conversion of this module. If it matches the current one, the conversion is skipped
+        loader: (string) The YAML loader backend: 'libyaml', 'python', or 'auto' to use libyaml whenever it is available
+        split: (bool) Whether or not to emit one submodule per top level class, plus one for the top level variables, which the module's __init__ imports lazily on first access
+        bytecode: (string) Compiles the generated module ahead of time. 'hash' writes hash-based .pyc files to __pycache__, 'sourceless' ships only .pyc files and removes the generated sources
+        optimize: (int) The optimization level of the compiled bytecode, as for compile(). With 'hash', the interpreter must run with the matching -O level to use levels above 0
+        deduplicate: (bool) Whether or not values that occur more than once, such as YAML aliases, are emitted once as a module level constant that every use site refers to. Shared lists and dicts are then the same object
+        flatten: (bool) Whether or not every class attribute is also emitted as a module level constant named after its path, e.g. PAGE_SIZE__PAGE_NAME__TEST. The classes remain, with their attributes referring to the constants
+        dependencies: (list) The paths of the files the YAML file included in the previous conversion of this module. They are part of the fingerprint
+        arrays: (int) Lists of at least this many ints, or of at least this many floats, are stored in a binary sidecar file instead of as list literals. Class attributes load their array on first access
+        array_type: (string) How the stored lists are exposed: 'memoryview' for read-only views of the memory mapped sidecar file, or 'array' for array.array copies
+        profile: (bool) Whether or not to collect byte, node and file counts for each stage in addition to its time, see the profile property
+        on_stage: A function that is called as on_stage(stage, metrics) after each stage, with the seconds the stage took and, when profiling, its counts
+        raise_errors: (bool) Whether or not errors raise a ConversionError, see conplex.core.errors, instead of exiting the process
+        source: (bytes) The YAML to convert, instead of the content of the file at yaml_path. The path then only names the YAML, and includes are resolved against it
+        data: The parsed content of the YAML, e.g. one document of a multi-document stream. The YAML is then not parsed again, but its source is still part of the fingerprint
+        includes: (dict) With data, maps the path of each file the parsed content included to its raw bytes
+        overlays: (list) The paths of YAML files that are merged over the YAML file, in order, e.g. environment overrides. The generated module
+        then has a _provenance submodule whose PROVENANCE dict maps the dotted path of every value to the file that supplied it
+        merge: (dict) Maps dotted key paths, or fnmatch patterns of them, to how overlays are merged there: 'merge' merges mappings key by key,
+        'replace' replaces the value as a whole, 'append' appends lists, and 'keep' keeps the first value, only adding missing keys to mappings.
+        Mappings, including !dict blocks, are merged by default and other values are replaced
+        index: (bool) Whether or not to emit an _index submodule whose INDEX dict maps the dotted path of every variable and class attribute,
+        e.g. 'Page_size.pageName.test', to its value, with get(path, default) and scan(prefix) helpers the module also exposes
     """
 
-    def __init__(self, yaml_path, output_dir=None, module_name=None, case_correction=False, verbose=False, silent=False):
+    def __init__(self, yaml_path, output_dir=None, module_name=None, case_correction=False, verbose=False, silent=False, fingerprint=None, loader='auto', split=False,
+                 bytecode=None, optimize=-1, deduplicate=False, flatten=False, dependencies=None, arrays=None, array_type='memoryview', profile=False, on_stage=None,
+                 raise_errors=False, source=None, data=None, includes=None, overlays=None, merge=None, index=False):
+
+        self.__yaml_path = yaml_path  # The path to the yaml file that will be converted
+        self.__verbose = verbose
+        self.__silent = silent
+        self.__raise_errors = raise_errors  # Whether or not errors are raised instead of exiting
 
         # Check that we do in fact have a YAML file at the yaml_path location
-        if not path.isfile(yaml_path) and yaml_path.endswith('yaml'):
-            if verbose:
-                if not silent:
-                    pt.warn('YAML file not found at location: {}'.format(yaml_path))
-            else:
-                if not silent:
-                    pt.warn('YAML file not found')
-            exit()
+        if source is None and not path.isfile(yaml_path) and yaml_path.endswith('yaml'):
+            self.__yaml_not_found()
 
         # Here we are going to set up our paths and output directories
         yaml_name = yaml_path.split('/')[-1]  # Get the name of the YAML configuration file
@@ -43,20 +173,79 @@ class YAMLConverter(object):
             module_name = module_name.replace(' ', '_')
         self.__module_name = module_name
 
-        self.__yaml_path = yaml_path  # The path to the yaml file that will be converted
         self.__output_dir = output_dir  # The directory in which the new Python module will be placed
         self.__output_path = path.join(output_dir + module_name)  # The path leading inside the new Python module
         self.__case_correction = case_correction  # Whether or not variable, attribute, and class names should be altered to fit standard Python conventions
-        self.__verbose = verbose
-        self.__silent = silent
+        self.__previous_fingerprint = fingerprint  # The fingerprint of the last conversion, used to skip unchanged modules
+        self.__loader = loader  # The requested YAML loader backend
+        self.__loader_backend = None  # This will become the name of the YAML loader backend actually used
+        self.__split = split  # Whether or not each top level class gets its own submodule
+        if bytecode not in (None, 'hash', 'sourceless'):
+            raise ValueError('Unknown bytecode mode: {}'.format(bytecode))
+        self.__bytecode = bytecode  # How the generated module is compiled ahead of time, if at all
+        self.__optimize = optimize  # The optimization level of the compiled bytecode
+        self.__deduplicate = deduplicate  # Whether or not repeated values are emitted once as shared constants
+        self.__flatten = flatten  # Whether or not class attributes are also emitted as flat module level constants
+        self.__arrays = arrays  # The minimum length of the lists stored in the sidecar file, or None to never use it
+        if array_type not in ('memoryview', 'array'):
+            raise ValueError('Unknown array type: {}'.format(array_type))
+        self.__array_type = array_type  # How the lists in the sidecar file are exposed
+        self.__profiling = profile  # Whether or not the stages are instrumented beyond their timings
+        self.__on_stage = on_stage  # The function called after each stage
+        self.__dependencies = list(dependencies or [])  # The paths of the included files, as of the previous conversion until the YAML file is parsed
 
+        self.__source = source  # This will become the raw bytes of the yaml file, unless they were given
+        self.__given_source = source is not None  # Whether or not the YAML was given rather than read from yaml_path
+        self.__includes = dict(includes or {})  # This will map the path of each included file to its raw bytes
+        self.__data = data  # The parsed YAML content, if it was given
+        self.__overlays = list(overlays or [])  # The paths of the files merged over the YAML file
+        for key_path, strategy in (merge or {}).items():
+            if strategy not in STRATEGIES:
+                raise ValueError('Unknown merge strategy for {}: {}'.format(key_path, strategy))
+        self.__merge = dict(merge or {})  # The merge strategies of the overlays
+        self.__overlay_sources = []  # This will become a list of the path and raw bytes of each overlay
+        self.__provenance = None  # This will map the dotted path of each value to the file that supplied it, when merging overlays
+        self.__index = index  # Whether or not the dotted path lookup index is emitted
+        self.__index_names = []  # This will become the list of index helpers the init file exposes
+        self.__fingerprint = None  # This will become the fingerprint of this conversion
+        self.__changed = False  # Whether or not this conversion rewrote any file in the module
+        self.__staging_path = None  # This will become the directory the rewritten files are staged in before they are published
+        self.__staged = []  # The names of the staged files, in the order they are published
+        self.__timings = {}  # This will map each stage of the conversion to the seconds it took
+        self.__metrics = {}  # This will map each stage of the conversion to its counts, when profiling
+        self.__skipped = False  # Whether or not the conversion was skipped because the fingerprint matched
         self.__yaml = None  # This will become the parsed yaml content
         self.__class_names = []  # This will become the list of class names in the Python configuration file
         self.__variable_names = []  # This will become the list of variable names not added as class attributes
-        self.__data_string = '# -*- coding: utf-8 -*-\n\n'  # This will become the content of the Python configuration file
+        self.__constant_names = []  # This will become the list of flattened constant names
+        self.__flat_names = {}  # This will map the path of each flattened class attribute to its constant name
+        self.__class_path = []  # The names of the classes enclosing the class that is currently being emitted
+        self.__submodules = {}  # This will map the name of each generated submodule to the emitter collecting its content
+        self.__name_submodules = {}  # This will map each class and variable name to the submodule it is defined in
+        self.__emitter = None  # The emitter of the submodule that is currently being generated
+        self.__shared_names = {}  # This will map the source of each deduplicated value to the name of its constant
+        self.__array_arguments = {}  # This will map the id of each list stored in the sidecar file to its offset, size and typecode
+        self.__array_data = None  # This will become the emitted content of the sidecar file
+        if not split:
+            self.__select_submodule(None, 'config')
 
     def __call__(self):
 
+        """
+        Runs the conversion. Returns the number of classes and variables in the
+        generated module, or None if the YAML file is unchanged since the conversion
+        that produced the given fingerprint
+        """
+
+        self.__run_stage('read', self.__read_yaml)
+        self.__fingerprint = self.__compute_fingerprint(self.__read_dependencies())
+        if self.__fingerprint == self.__previous_fingerprint and self.__is_generated():
+            if self.__verbose:
+                if not self.__silent:
+                    pt.info('{} is unchanged, skipping generation'.format(self.__yaml_path.split('/')[-1]))
+            self.__skipped = True
+            return None
+
         if self.__case_correction:
             if not self.__silent:
                 pt.notice('Using automatic case correction is experimental and may not always work correctly')
@@ -68,99 +257,696 @@ class YAMLConverter(object):
         if not self.__silent:
             pt.info('Generating Python configuration from {}'.format(self.__yaml_path.split('/')[-1]))
 
-        self.__load_yaml()
-        self.__construct_python_config_string()
-        self.__write_python_file()
-        self.__write_init_file()
+        self.__run_stage('parse', self.__load_yaml)
+        # The includes may have changed along with the YAML file, so the fingerprint is taken over the files that were actually read
+        self.__dependencies = list(self.__includes)
+        self.__fingerprint = self.__compute_fingerprint(self.__includes.items())
+        self.__emit()
+        try:
+            self.__run_stage('write', self.__write_python_file)
+            self.__run_stage('write', self.__write_init_file)
+            self.__run_stage('publish', self.__publish)
+        finally:
+            self.__discard_staging()
+        if self.__bytecode is not None:
+            self.__run_stage('compile', self.__compile_bytecode)
 
         if not self.__silent:
             pt.success('Generated Python configuration module with {} classes and {} variable(s)'.format(len(self.__class_names), len(self.__variable_names)))
 
         return len(self.__class_names), len(self.__variable_names)
 
-    def __load_yaml(self):
+    def generate(self):
+
+        """
+        Runs the conversion without touching the output directory. Returns a
+        dict mapping the name of each file of the generated module to its
+        content, which is a string for sources and bytes for the array file.
+        The files are in the order they would be published in. A YAMLParseError
+        is reported if the YAML is not a non-empty mapping, as there would be
+        no module to generate
+        """
+
+        self.__run_stage('read', self.__read_yaml)
+        self.__run_stage('parse', self.__load_yaml)
+        if type(self.__yaml) is not dict or not self.__yaml:
+            self.__fail(YAMLParseError, 'The YAML must be a mapping with at least one key to generate a module')
+        self.__dependencies = list(self.__includes)
+        self.__fingerprint = self.__compute_fingerprint(self.__includes.items())
+        self.__emit()
+
+        files = {}
+        if self.__array_data is not None:
+            files['_arrays.bin'] = self.__array_data.getvalue()
+        for submodule, emitter in sorted(self.__submodules.items(), key=lambda item: item[0] != '_arrays'):
+            files[submodule + '.py'] = emitter.getvalue()
+        init = self.__construct_init()
+        if init is not None:
+            files['__init__.py'] = init.getvalue()
+        return files
+
+    @classmethod
+    def from_module(cls, module, **kwargs):
+
+        """
+        Creates a converter for a module registered in the .conplex file,
+        using the options stored for it
+
+        args:
+            module: The module dict, as stored in the project data
+            kwargs: Additional arguments for the converter, e.g. silent
+        """
+
+        return cls(module['yaml_path'],
+                   output_dir=module.get('output_dir'),
+                   module_name=module['module_name'],
+                   case_correction=module['case_correction'],
+                   fingerprint=module.get('fingerprint'),
+                   loader=module.get('loader', 'auto'),
+                   split=module.get('split', False),
+                   bytecode=module.get('bytecode'),
+                   optimize=module.get('optimize', -1),
+                   deduplicate=module.get('deduplicate', False),
+                   dependencies=module.get('dependencies'),
+                   flatten=module.get('flatten', False),
+                   arrays=module.get('arrays'),
+                   array_type=module.get('array_type', 'memoryview'),
+                   overlays=module.get('overlays'),
+                   merge=module.get('merge'),
+                   index=module.get('index', False),
+                   **kwargs)
+
+    @property
+    def fingerprint(self):
+
+        """
+        Returns the fingerprint of the YAML source and options of this conversion
+        """
+
+        return self.__fingerprint
+
+    @property
+    def output_path(self):
 
         """
-        Loads and parses the YAML configuration file
+        Returns the path of the directory of the generated module
         """
 
-        import yaml
+        return self.__output_path
+
+    @property
+    def dependencies(self):
+
+        """
+        Returns the paths of all files the YAML file includes, directly or
+        through other included files, and of the overlays merged over it
+        """
+
+        return list(self.__dependencies)
+
+    @property
+    def provenance(self):
+
+        """
+        Returns a dict mapping the dotted path of every value to the file that
+        supplied it, or None if no overlays were merged
+        """
+
+        return None if self.__provenance is None else dict(self.__provenance)
+
+    @property
+    def timings(self):
+
+        """
+        Returns a dict with the seconds each stage of the last call took. The
+        stages are read, parse, emit, write and compile
+        """
+
+        return dict(self.__timings)
+
+    @property
+    def profile(self):
+
+        """
+        Returns a JSON serializable report of the conversion, with the time of
+        each stage and, if the profile option is set, its counts: the bytes
+        read, the parsed nodes and included files, the emitted characters and
+        the case correction cache hits and misses, and the files and bytes
+        written
+        """
+
+        stages = {}
+        for stage, seconds in self.__timings.items():
+            stages[stage] = dict(self.__metrics.get(stage, {}), seconds=seconds)
+        return {
+            'yaml_path': self.__yaml_path,
+            'module_name': self.__module_name,
+            'fingerprint': self.__fingerprint,
+            'skipped': self.__skipped,
+            'changed': self.__changed,
+            'loader': self.__loader_backend,
+            'seconds': sum(self.__timings.values()),
+            'stages': stages
+        }
+
+    @property
+    def loader_backend(self):
+
+        """
+        Returns the name of the YAML loader backend used for parsing
+        """
+
+        return self.__loader_backend
+
+    @property
+    def changed(self):
+
+        """
+        Returns whether or not the last call rewrote any file of the module
+        """
+
+        return self.__changed
+
+    def __run_stage(self, stage, method):
+
+        """
+        Runs one stage of the conversion and adds the time it took to the timings
+        """
+
+        if self.__profiling:
+            from .profiling import case_cache_info
+            cache_before = case_cache_info()
+        start = perf_counter()
+        method()
+        elapsed = perf_counter() - start
+        self.__timings[stage] = self.__timings.get(stage, 0.0) + elapsed
+
+        metrics = {}
+        if self.__profiling:
+            metrics = self.__measure_stage(stage)
+            if stage == 'emit':
+                cache_after = case_cache_info()
+                metrics['case_cache_hits'] = cache_after[0] - cache_before[0]
+                metrics['case_cache_misses'] = cache_after[1] - cache_before[1]
+            self.__metrics[stage] = metrics
+        if self.__on_stage is not None:
+            self.__on_stage(stage, dict(metrics, seconds=elapsed))
+
+    def __measure_stage(self, stage):
+
+        """
+        Returns the counts of a stage that just ran. The counts of the write
+        stage cover every file staged so far
+        """
+
+        from .profiling import count_nodes
+
+        if stage == 'read':
+            return {'bytes': len(self.__source)}
+        if stage == 'parse':
+            return {'nodes': count_nodes(self.__yaml),
+                    'includes': len(self.__includes),
+                    'include_bytes': sum(len(source) for source in self.__includes.values())}
+        if stage == 'emit':
+            return {'characters': sum(len(emitter) for emitter in self.__submodules.values()),
+                    'submodules': len(self.__submodules),
+                    'classes': len(self.__class_names),
+                    'variables': len(self.__variable_names),
+                    'constants': len(self.__constant_names) + len(self.__shared_names)}
+        if stage == 'write':
+            return {'files': len(self.__staged),
+                    'bytes': sum(path.getsize(path.join(self.__staging_path, file_name)) for file_name in self.__staged)}
+        if stage == 'publish':
+            return {'files': len(self.__staged)}
+        return {}
+
+    def __is_generated(self):
+
+        """
+        Checks that the files of a previous conversion are still in place
+        """
+
+        extension = '.pyc' if self.__bytecode == 'sourceless' else '.py'
+        if not self.__split and not path.isfile(path.join(self.__output_path, 'config' + extension)):
+            return False
+        return path.isfile(path.join(self.__output_path, '__init__' + extension))
+
+    def __read_yaml(self):
+
+        """
+        Reads the raw bytes of the YAML configuration file
+        """
 
         yaml_path = self.__yaml_path
+        self.__read_overlays()
+        if self.__given_source:
+            return
         if path.isfile(yaml_path) and yaml_path.endswith('yaml'):
             try:
-                with open(self.__yaml_path, 'r') as yaml_file:
-                    try:
-                        self.__yaml = yaml.load(yaml_file)
-                    except Exception as e_1:
-                        if self.__verbose:
-                            if not self.__silent:
-                                pt.error(e_1)
-                        if not self.__silent:
-                            pt.warn('Could not parse YAML file. Please check formatting, indentation, and aliases and try again')
-                        exit()
+                with open(yaml_path, 'rb') as yaml_file:
+                    self.__source = yaml_file.read()
             except IOError as e_2:
-                if self.__verbose:
-                    if not self.__silent:
-                        pt.error(e_2)
-                if not self.__silent:
-                    pt.warn('Could not load YAML file: {}'.format(yaml_path.split('/')[-1]))
-                exit()
+                self.__fail(YAMLNotFoundError, 'Could not load YAML file: {}'.format(yaml_path.split('/')[-1]), e_2)
         else:
-            if self.__verbose:
-                if not self.__silent:
-                    pt.warn('YAML file not found at location: {}'.format(yaml_path))
+            self.__yaml_not_found()
+
+    def __read_overlays(self):
+
+        """
+        Reads the raw bytes of the overlay files
+        """
+
+        self.__overlay_sources = []
+        for overlay_path in self.__overlays:
+            try:
+                with open(overlay_path, 'rb') as overlay_file:
+                    self.__overlay_sources.append((overlay_path, overlay_file.read()))
+            except IOError as e:
+                self.__fail(YAMLNotFoundError, 'Could not load overlay file: {}'.format(overlay_path), e)
+
+    def __yaml_not_found(self):
+
+        """
+        Reports that there is no YAML file at the yaml_path location
+        """
+
+        if self.__verbose:
+            message = 'YAML file not found at location: {}'.format(self.__yaml_path)
+        else:
+            message = 'YAML file not found'
+        self.__fail(YAMLNotFoundError, message)
+
+    def __fail(self, error_class, message, error=None):
+
+        """
+        Reports an error that stops the conversion. The error is raised if the
+        raise_errors option is set, otherwise the process exits
+
+        args:
+            error_class: (type) The ConversionError subclass to raise
+            message: (string) The message printed and passed to the raised error
+            error: (Exception) The original error, if any. It is printed in verbose mode
+        """
+
+        if error is not None and self.__verbose:
+            if not self.__silent:
+                pt.error(error)
+        if not self.__silent:
+            pt.warn(message)
+        if self.__raise_errors:
+            raise error_class(message, yaml_path=self.__yaml_path) from error
+        exit()
+
+    def __read_dependencies(self):
+
+        """
+        Reads the files included by the previous conversion. Returns a list of
+        (path, bytes) pairs, with None for files that no longer exist
+        """
+
+        dependencies = []
+        for dependency_path in self.__dependencies:
+            try:
+                with open(dependency_path, 'rb') as dependency_file:
+                    dependencies.append((dependency_path, dependency_file.read()))
+            except IOError:
+                dependencies.append((dependency_path, None))
+        return dependencies
+
+    def __compute_fingerprint(self, dependencies):
+
+        """
+        Computes the fingerprint of this conversion from the YAML source, the
+        given included files and the options that affect the generated module
+        """
+
+        return fingerprint(self.__source,
+                           dependencies,
+                           module_name=self.__module_name,
+                           case_correction=self.__case_correction,
+                           split=self.__split,
+                           bytecode=self.__bytecode,
+                           optimize=self.__optimize,
+                           deduplicate=self.__deduplicate,
+                           flatten=self.__flatten,
+                           arrays=self.__arrays,
+                           array_type=self.__array_type,
+                           overlays=self.__overlays,
+                           merge=self.__merge,
+                           index=self.__index,
+                           cache_tag=implementation.cache_tag if self.__bytecode else None)
+
+    def __load_yaml(self):
+
+        """
+        Parses the YAML configuration file, along with the files it includes
+        """
+
+        if self.__data is not None:
+            self.__yaml = self.__data
+            return
+
+        from conplex.core.loader import get_loader, load, LIBYAML
+
+        loader, self.__loader_backend = get_loader(self.__loader)
+        if self.__loader == LIBYAML and self.__loader_backend != LIBYAML:
+            if not self.__silent:
+                pt.notice('libyaml is not available, falling back to the pure Python YAML loader')
+        if self.__verbose:
+            if not self.__silent:
+                pt.info('Parsing YAML with the {} loader'.format(self.__loader_backend))
+
+        try:
+            if self.__overlays:
+                from conplex.core.overlay import merge_files
+                # The overlays are recorded along with the included files, so changing one of them changes the fingerprint
+                self.__includes.update(self.__overlay_sources)
+                files = [(self.__yaml_path, self.__source)] + self.__overlay_sources
+                self.__yaml, self.__provenance = merge_files(files, loader, self.__merge, self.__includes)
             else:
-                if not self.__silent:
-                    pt.warn('YAML file not found')
-            exit()
+                self.__yaml = load(self.__source, loader, self.__yaml_path, self.__includes)
+        except Exception as e_1:
+            self.__fail(YAMLParseError, 'Could not parse YAML file. Please check formatting, indentation, and aliases and try again', e_1)
+
+    def __emit(self):
+
+        """
+        Runs the emit stage. Errors raised while emitting, such as a key that
+        case correction can not translate, are reported as a ConversionError
+        """
+
+        try:
+            self.__run_stage('emit', self.__construct_python_config_string)
+        except ConversionError:
+            raise
+        except Exception as e:
+            self.__fail(ConversionError, 'Could not generate Python code from the YAML file. Please check the keys and values and try again', e)
 
     def __construct_python_config_string(self):
 
         """
-        Constructs the Python data string that will be written to the output Python
+        Emits the Python source that will be written to the output Python
         configuration file
-        """        
+        """
 
         yaml = self.__yaml
         if yaml is not None and type(yaml) == dict:
-            for name, attributes in sort_dict_last(yaml).items():
-
-                # Handle the dictionary flag
-                if '!dict' in name:
-                    name = name.replace('!dict', '')
-                    if isinstance(attributes, dict):
-                        if self.__case_correction:
-                            name = snake_case(name)
-                        else:
-                            name = name.replace(' ', '_')
-                        self.__variable_names.append(name)
-                        self.__data_string += self.__add_attribute(name, attributes)
-                        continue
+            if self.__arrays is not None:
+                self.__add_arrays()
+            if self.__deduplicate:
+                self.__add_shared_values()
+            names = translate_keys(yaml, self.__case_correction)
+            for key, attributes in sort_dict_last(yaml).items():
+                name = names[key]
+
                 # Handle creating a new class
-                if isinstance(attributes, dict):
-                    if self.__case_correction:
-                        name = upper_camel_case(name)
-                    else:
-                        name = name.replace(' ', '_')
+                if is_class(key, attributes):
                     if ' ' in name:
                         name = name.replace(' ', '')  # Remove spaces just in case
                     self.__class_names.append(name)
-                    self.__data_string += self.__add_class(name, attributes)
+                    self.__select_submodule(name, '_' + name)
+                    if self.__flatten:
+                        self.__add_flat_constants(name, attributes)
+                    self.__add_class(name, attributes)
                     if self.__verbose:
                         if not self.__silent:
                             pt.info('Added Python class with {} attributes titled: {}'.format(len(attributes), name))
-                # Handle adding a new variable
+                # Handle adding a new variable, including dictionaries with the dictionary flag
                 else:
-                    if self.__case_correction:
-                        name = snake_case(name)
-                    else:
-                        name = name.replace(' ', '_')
                     self.__variable_names.append(name)
-                    self.__data_string += self.__add_attribute(name, attributes)
+                    self.__select_submodule(name, '_variables')
+                    self.__add_attribute(name, attributes)
                     if self.__verbose:
                         if not self.__silent:
                             pt.info('Added Python variable titled: {}'.format(name))
+            if self.__provenance is not None:
+                self.__add_provenance()
+            if self.__index:
+                self.__add_index()
+
+    def __add_index(self):
+
+        """
+        Emits the _index submodule, which maps the dotted path of every
+        variable and class attribute to its value, so a lookup by path is a
+        single dict probe. The values refer to the emitted variables and
+        attributes rather than repeating them
+        """
+
+        yaml = self.__yaml
+        paths = []
+        stack = []
+        names = translate_keys(yaml, self.__case_correction)
+        for key, value in yaml.items():
+            if is_class(key, value):
+                stack.append(((names[key].replace(' ', ''),), value))
+            else:
+                paths.append(names[key])
+        while stack:
+            class_path, attributes = stack.pop()
+            attribute_names = translate_keys(attributes, self.__case_correction)
+            for key, value in attributes.items():
+                if is_class(key, value):
+                    stack.append((class_path + (attribute_names[key],), value))
+                else:
+                    paths.append('.'.join(class_path + (attribute_names[key],)))
+        paths.sort()
+
+        imports = {}  # Maps each submodule to the top level names the index refers to
+        for name in self.__class_names + self.__variable_names:
+            imports.setdefault(self.__name_submodules[name], []).append(name)
+        emitter = CodeEmitter(HEADER)
+        for submodule, submodule_names in imports.items():
+            emitter.line('from .{} import {}'.format(submodule, ', '.join(submodule_names)))
+        emitter.line()
+        emitter.line('INDEX = {')
+        for key_path in paths:
+            emitter.line('{!r}: {},'.format(key_path, key_path), ' ' * 4)
+        emitter.line('}')
+        emitter.write(INDEX_HELPERS)
+        self.__add_option_submodule('_index', emitter, 'index')
+
+        used_names = set(self.__class_names + self.__variable_names + self.__constant_names)
+        self.__index_names = [name for name in INDEX_NAMES if name not in used_names]
+        for name in self.__index_names:
+            self.__name_submodules[name] = '_index'
+
+    def __add_provenance(self):
+
+        """
+        Emits the _provenance submodule, which maps the dotted path of every
+        value to the file that supplied it. The init file does not import it
+        """
+
+        emitter = CodeEmitter(HEADER)
+        emitter.line('PROVENANCE = {')
+        for key_path, file_path in sorted(self.__provenance.items()):
+            emitter.line('{!r}: {!r},'.format(key_path, file_path), ' ' * 4)
+        emitter.line('}')
+        self.__add_option_submodule('_provenance', emitter, 'overlays')
+
+    def __add_option_submodule(self, submodule, emitter, option):
+
+        """
+        Adds a submodule that an option emits after the classes. In split
+        mode, a top level class with the same name already has a submodule
+        of that name, so the conversion fails rather than dropping the class
+
+        args:
+            submodule: (string) The name of the submodule, e.g. _index
+            emitter: (CodeEmitter) The source of the submodule
+            option: (string) The converter option the submodule belongs to
+        """
+
+        if submodule in self.__submodules:
+            self.__fail(ConversionError, 'The top level class {} collides with the {} submodule of the {} option. Rename it or convert '
+                                         'without split'.format(submodule[1:], submodule, option))
+        self.__submodules[submodule] = emitter
+
+    def __select_submodule(self, name, submodule):
+
+        """
+        Directs the emitted source of a top level class or variable to the
+        submodule it belongs to. Without the split option, everything goes
+        to the config submodule
+
+        args:
+            name: The name of the class or variable that is about to be emitted
+            submodule: The submodule it belongs to in split mode
+        """
+
+        if not self.__split:
+            submodule = 'config'
+        if submodule not in self.__submodules:
+            self.__submodules[submodule] = CodeEmitter(HEADER)
+            if self.__split and self.__array_data is not None:
+                self.__submodules[submodule].line('from ._arrays import LazyArray, load_array')
+            if self.__split and self.__shared_names:
+                self.__submodules[submodule].line('from ._shared import *')
+            if self.__split and (self.__shared_names or self.__array_data is not None):
+                self.__submodules[submodule].line()
+        self.__emitter = self.__submodules[submodule]
+        if name is not None:
+            self.__name_submodules[name] = submodule
+
+    @staticmethod
+    def __render_value(value):
+
+        """
+        Returns the Python source of a value. Strings are written as their
+        repr, so quotes, backslashes and line breaks in them are escaped
+        """
+
+        if isinstance(value, str):
+            return repr(value)
+        return '{}'.format(value)
+
+    def __value_source(self, value, lazy=False):
+
+        """
+        Returns the Python source a value is emitted as, which is the name of
+        its shared constant if the value was deduplicated, or a call loading
+        it from the sidecar file if it is stored there
+
+        args:
+            value: The value
+            lazy: Whether or not a stored list is only loaded on first access, which is possible for class attributes
+        """
+
+        if self.__array_arguments:
+            arguments = self.__array_arguments.get(id(value))
+            if arguments is not None:
+                return '{}({}, {}, {!r})'.format('LazyArray' if lazy else 'load_array', *arguments)
+        source = self.__render_value(value)
+        return self.__shared_names.get(source, source)
+
+    def __add_shared_values(self):
+
+        """
+        Finds the values that are emitted more than once and emits each of
+        them once as a module level constant. Lists and dicts are always
+        shared when they repeat, other values only when their source is at
+        least SHARED_MIN_LENGTH characters long. In split mode, the
+        constants are placed in a _shared submodule the others import
+        """
+
+        counts = {}  # Maps the source of each candidate value to the number of times it is emitted
+        stack = [self.__yaml]  # Mappings still to visit
+        while stack:
+            mapping = stack.pop()
+            for key, value in mapping.items():
+                if is_class(key, value):
+                    stack.append(value)
+                    continue
+                if id(value) in self.__array_arguments:
+                    continue  # Stored lists are shared through the sidecar file instead
+                source = self.__render_value(value)
+                if isinstance(value, (list, dict)) or len(source) >= SHARED_MIN_LENGTH:
+                    counts[source] = counts.get(source, 0) + 1
+
+        for source, count in counts.items():
+            if count > 1:
+                self.__shared_names[source] = '_SHARED_{}'.format(len(self.__shared_names))
+        if not self.__shared_names:
+            return
+
+        if self.__split:
+            self.__submodules['_shared'] = CodeEmitter(HEADER)
+            emitter = self.__submodules['_shared']
+        else:
+            emitter = self.__submodules['config']
+        for source, name in self.__shared_names.items():
+            emitter.line('{} = {}'.format(name, source))
+        if self.__split:
+            emitter.line('__all__ = ' + str(list(self.__shared_names.values())))
+        emitter.line()
+        if self.__verbose:
+            if not self.__silent:
+                pt.info('Deduplicated {} shared value(s)'.format(len(self.__shared_names)))
+
+    def __add_arrays(self):
+
+        """
+        Finds the lists that are long enough and hold only ints or only floats,
+        and emits their values to the sidecar file as little endian arrays.
+        Equal lists are stored once. The generated modules then import the
+        loading helpers from an _arrays submodule
+        """
+
+        from array import array
+        import sys
+
+        data = ByteEmitter()
+        offsets = {}  # Maps the content of each stored array to its offset
+        stack = [self.__yaml]
+        while stack:
+            mapping = stack.pop()
+            for key, value in mapping.items():
+                if is_class(key, value):
+                    stack.append(value)
+                    continue
+                if type(value) is not list or len(value) < self.__arrays or id(value) in self.__array_arguments:
+                    continue
+                typecode = array_typecode(value)
+                if typecode is None:
+                    continue
+                values = array(typecode, value)
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                content = values.tobytes()
+                if content not in offsets:
+                    offsets[content] = len(data)
+                    data.write(content)
+                    data.write(b'\0' * (-len(data) % ARRAY_ALIGNMENT))
+                self.__array_arguments[id(value)] = offsets[content], len(content), typecode
+        if not offsets:
+            return
+
+        self.__array_data = data
+        self.__submodules['_arrays'] = CodeEmitter(HEADER)
+        self.__submodules['_arrays'].write(ARRAYS_MODULE.format(array_type=self.__array_type))
+        if not self.__split:
+            self.__submodules['config'].line('from ._arrays import LazyArray, load_array')
+            self.__submodules['config'].line()
+        if self.__verbose:
+            if not self.__silent:
+                pt.info('Stored {} list(s) in the array sidecar file'.format(len(offsets)))
+
+    def __add_flat_constants(self, class_name, attributes):
+
+        """
+        Emits every attribute of a top level class and its nested classes as
+        a module level constant, named after the path of the attribute. The
+        constants are emitted right before the class, in the same order as
+        the class attributes
+
+        args:
+            class_name: The name of the top level class
+            attributes: A dict containing attribute name, attribute value pairs
+        """
+
+        emitter = self.__emitter
+        used_names = set(self.__class_names + self.__variable_names + self.__constant_names)
+        # Each entry holds the path of a class, an iterator over its remaining attributes, and their names
+        stack = [((class_name,), iter(sort_dict_last(attributes).items()), translate_keys(attributes, self.__case_correction))]
+        while stack:
+            class_path, items, names = stack[-1]
+            for key, value in items:
+                if is_class(key, value):
+                    stack.append((class_path + (names[key],), iter(sort_dict_last(value).items()), translate_keys(value, self.__case_correction)))
+                    break
+                attribute_path = class_path + (names[key],)
+                constant_name = '__'.join(constant_case(part) for part in attribute_path)
+                while constant_name in used_names:
+                    constant_name += '_'
+                used_names.add(constant_name)
+                self.__constant_names.append(constant_name)
+                self.__name_submodules[constant_name] = self.__name_submodules[class_name]
+                self.__flat_names[attribute_path] = constant_name
+                emitter.line('{} = {}'.format(constant_name, self.__value_source(value)))
+            else:
+                stack.pop()
+        emitter.line()
 
     def __add_attribute(self, name, value, indentation=''):
 
@@ -168,67 +954,61 @@ class YAMLConverter(object):
         Adds a variable to the Python configuration file
         """
 
-        return indentation + '{} = {}\n'.format(name, value)
+        self.__emitter.line('{} = {}'.format(name, self.__value_source(value)), indentation)
+
+    def __add_class(self, name, attributes):
 
-    def __add_class(self, name, attributes, indentation_count=0):
-        
         """
-        Builds out a class structure and adds it to the data string
+        Builds out a class structure and emits it to the Python configuration file.
+        Nested classes are emitted from an explicit stack rather than through
+        recursion, so there is no limit on how deeply classes can be nested
 
         args:
             name: The name of the new class
             attributes: A dict containing attribute name, attribute value pairs
-            indentation: A string containing the number of spaces the class should be indented
         """
 
         # TODO: improve the spacing and formatting of the output string
 
-        indentation = (' ' * 4) + ('    ' * indentation_count)
-        case_correction = self.__case_correction
-        x = 'class {}:'.format(name)  # Build the base string for the class
-        x += '\n\n'  # Two newlines for formatting
-
-        # Here we loop through the attributes and add them to x. If the attribute value is a 
-        # string we will wrap it in single quotes.
-        for attr_name, attr_value in sort_dict_last(attributes).items():
-
-            # Handle the dictionary flag
-            if '!dict' in attr_name:
-                attr_name = attr_name.replace('!dict', '')
-                if isinstance(attr_value, dict):
-                    if case_correction:
-                        attr_name = snake_case(attr_name)
-                    else:
-                        attr_name = attr_name.replace(' ', '_')
-                    x += indentation + '{} = {}'.format(attr_name, attr_value)
-                    x += '\n'  # Newline for formatting
-                    continue
+        emitter = self.__emitter
+        class_path = self.__class_path
+        indentations = ['', ' ' * 4]  # The indentation of each nesting level, built once per level
+        stack = []  # Each entry holds an iterator over the remaining attributes of an open class, their names, and its nesting level
+        pending = (name, attributes, 0)  # The class to open next, with its attributes and nesting level
+        while pending is not None or stack:
+            if pending is not None:
+                name, attributes, depth = pending
+                pending = None
+                if len(indentations) < depth + 2:
+                    indentations.append(indentations[-1] + ' ' * 4)
+                class_path.append(name)
+                emitter.line('class {}:'.format(name), indentations[depth])  # Build the base string for the class
+                emitter.line()  # Blank line for formatting
+                stack.append((iter(sort_dict_last(attributes).items()), translate_keys(attributes, self.__case_correction), depth))
 
-            # Handle adding the dictionary as a class recursively if it doesn't have the dict flag
-            if isinstance(attr_value, dict):
-                x += '\n'
-                if case_correction:
-                    attr_name = upper_camel_case(attr_name)
-                else:
-                    attr_name = attr_name.replace(' ', '_')
-                attr_indentation = '' * 4  # A single indentation of 4 spaces
-                x += indentation + self.__add_class(attr_name, attr_value, indentation_count=indentation_count + 1)
+            # Here we loop through the attributes and emit them. If the attribute value is a
+            # string we will wrap it in single quotes.
+            items, names, depth = stack[-1]
+            indentation = indentations[depth + 1]
+            for key, attr_value in items:
+                attr_name = names[key]
 
-            # Handle all other data types
-            else:
-                if case_correction:
-                    attr_name = snake_case(attr_name)
-                else:
-                    attr_name = attr_name.replace(' ', '_')
-                x += indentation + '{} = '.format(attr_name)  # Build the base attribute string
-                if isinstance(attr_value, str):
-                    x += "'{}'".format(attr_value)
-                else:
-                    x += '{}'.format(attr_value)
-                x += '\n'
+                # Handle adding the dictionary as a nested class if it doesn't have the dict flag.
+                # The rest of this class is emitted once the nested class is closed
+                if is_class(key, attr_value):
+                    emitter.line()
+                    pending = (attr_name, attr_value, depth + 1)
+                    break
 
-        x += '\n'  # Newline for formatting
-        return x
+                # Handle all other data types, including dictionaries with the dictionary flag
+                elif self.__flatten:
+                    emitter.line('{} = {}'.format(attr_name, self.__flat_names[tuple(class_path) + (attr_name,)]), indentation)
+                else:
+                    emitter.line('{} = {}'.format(attr_name, self.__value_source(attr_value, lazy=True)), indentation)
+            else:
+                emitter.line()  # Blank line for formatting
+                class_path.pop()
+                stack.pop()
 
     def __write_init_file(self):
 
@@ -236,70 +1016,215 @@ class YAMLConverter(object):
         Writes a Python init file for the configuration module
         """
 
+        init = self.__construct_init()
+        if init is not None:
+            init_file_path = self.__stage_file('__init__.py', init)
+            if init_file_path is None:
+                return
+            try:
+                with open(init_file_path, 'w') as init_file:
+                    try:
+                        init.write_to(init_file)
+                    except Exception as e_1:
+                        self.__fail(OutputError, 'An error occurred while writing to the init file for the Python configuration module', e_1)
+            except IOError as e_2:
+                self.__fail(OutputError, 'An error occurred while creating the init file for the Python configuration module', e_2)
+                
+    def __construct_init(self):
+
+        """
+        Emits the init file of the configuration module. Returns None if no
+        YAML was parsed
+        """
+
+        if self.__yaml is None:
+            return None
+        names = self.__class_names + self.__variable_names + self.__constant_names
+        if self.__split:
+            return self.__construct_lazy_init(names)
+        init = CodeEmitter()
+        if names:
+            init.line('from .config import ' + ', '.join(names))  # Import classes and variables
+        init.write('__all__ = ' + str(names))  # Set __all__
+        if self.__index_names:
+            index_names = self.__index_names
+            init.write(INDEX_INIT.format(names=tuple(index_names),
+                                         imports=', '.join(index_names),
+                                         updates=', '.join('{0}={0}'.format(name) for name in index_names)))
+        return init
+
+    def __construct_lazy_init(self, names):
+
+        """
+        Emits an init file that imports each class and variable from its
+        submodule on first access, using a module level __getattr__
+
+        args:
+            names: The names of all classes and variables, in order
+        """
+
+        init = CodeEmitter(HEADER)
+        init.line('from importlib import import_module')
+        init.line()
+        init.line('TYPE_CHECKING = False')
+        init.line()
+        init.line('_submodules = {')
+        for name in names + self.__index_names:
+            init.line('{!r}: {!r},'.format(name, '.' + self.__name_submodules[name]), ' ' * 4)
+        init.line('}')
+        init.line('__all__ = ' + str(names))
+        init.line()
+        # Static imports for type checkers and code completion, never executed
+        init.line('if TYPE_CHECKING:')
+        for submodule in self.__submodules:
+            submodule_names = [name for name in names + self.__index_names if self.__name_submodules[name] == submodule]
+            if submodule_names:
+                init.line('from .{} import {}'.format(submodule, ', '.join(submodule_names)), ' ' * 4)
+        if not names:
+            init.line('pass', ' ' * 4)
+        init.line()
+        init.write(LAZY_INIT)
+        return init
+
+    def __compile_bytecode(self):
+
+        """
+        Compiles the generated source files ahead of time. The .pyc files use
+        hash-based invalidation and record the source path relative to the
+        output directory, so they are reproducible and valid on any machine.
+        In sourceless mode, the .pyc files are placed next to the sources,
+        which are then removed
+        """
+
+        import py_compile
+        from importlib.util import cache_from_source
+
+        file_names = list(self.__submodules)
         if self.__yaml is not None:
-            x = ''
-            # Import classes
-            for i, class_name in enumerate(self.__class_names):
-                if i == 0:
-                    x += class_name
-                else:
-                    x += ', {}'.format(class_name)
+            file_names.append('__init__')
+        for file_name in file_names:
+            source_path = path.join(self.__output_path, file_name + '.py')
+            if self.__bytecode == 'sourceless':
+                bytecode_path = path.join(self.__output_path, file_name + '.pyc')
+                invalidation_mode = py_compile.PycInvalidationMode.UNCHECKED_HASH
+            else:
+                optimization = self.__optimize if self.__optimize > 0 else ''
+                bytecode_path = cache_from_source(source_path, optimization=optimization)
+                invalidation_mode = py_compile.PycInvalidationMode.CHECKED_HASH
+                if not self.__changed and path.isfile(bytecode_path):
+                    continue
+            try:
+                py_compile.compile(source_path,
+                                   cfile=bytecode_path,
+                                   dfile=path.join(self.__module_name, file_name + '.py'),
+                                   doraise=True,
+                                   optimize=self.__optimize,
+                                   invalidation_mode=invalidation_mode)
+                if self.__bytecode == 'sourceless':
+                    remove(source_path)
+            except (py_compile.PyCompileError, OSError) as e:
+                self.__fail(CompileError, 'An error occurred while compiling the Python configuration module', e)
+        if self.__verbose:
+            if not self.__silent:
+                pt.info('Compiled {} file(s) to {} bytecode'.format(len(file_names), self.__bytecode))
 
-            # Import variables
-            for i, variable_name in enumerate(self.__variable_names):
-                x += ', {}'.format(variable_name)
+    def __stage_file(self, file_name, emitter):
 
-            x = 'from .config import ' + x
-            x += '\n'
+        """
+        Returns the path in the staging directory the file should be written
+        to, or None if the published file already holds the emitted source.
+        Files are never written in place, so that a process importing the
+        module during a conversion can not read a partially written file
 
-            # Set __all__
-            x += '__all__ = ' + str(self.__class_names + self.__variable_names)
+        args:
+            file_name: The name of the file inside the module directory
+            emitter: (CodeEmitter or ByteEmitter) The emitted content of the file
+        """
 
-            init_file_path = path.join(self.__output_path, '__init__.py')
+        if emitter.matches(path.join(self.__output_path, file_name)):
+            return None
+        self.__changed = True
+        if self.__staging_path is None:
+            from tempfile import mkdtemp
             try:
-                with open(init_file_path, 'w+') as init_file:
-                    try:
-                        init_file.write(x)
-                    except Exception as e_1:
-                        if self.__verbose:
-                            if not self.__silent:
-                                pt.error(e_1)
-                        if not self.__silent:
-                            pt.warn('An error occurred while writing to the init file for the Python configuration module')
-                        exit()
-            except IOError as e_2:
-                if self.__verbose:
-                    if not self.__silent:
-                        pt.error(e_2)
-                if not self.__silent:
-                    pt.warn('An error occurred while creating the init file for the Python configuration module')
-                exit()
-                
+                # Inside the module directory, so the files can be renamed into place on the same file system
+                self.__staging_path = mkdtemp(prefix='.staging-', dir=self.__output_path)
+            except OSError as e:
+                self.__fail(OutputError, 'An error occurred while creating the staging directory for the Python configuration module', e)
+        self.__staged.append(file_name)
+        return path.join(self.__staging_path, file_name)
+
+    def __publish(self):
+
+        """
+        Moves the staged files over the published ones. Every rename is atomic,
+        so importers see either the old or the new version of each file. The
+        submodules are published first and the init file last, so that a new
+        init file never refers to names that are not yet published
+        """
+
+        try:
+            for file_name in self.__staged:
+                replace(path.join(self.__staging_path, file_name), path.join(self.__output_path, file_name))
+        except OSError as e:
+            self.__fail(OutputError, 'An error occurred while publishing the Python configuration module', e)
+
+    def __discard_staging(self):
+
+        """
+        Removes the staging directory along with any file that was not published
+        """
+
+        if self.__staging_path is not None:
+            from shutil import rmtree
+            rmtree(self.__staging_path, ignore_errors=True)
+            self.__staging_path = None
+        self.__staged = []
+
     def __write_python_file(self):
 
         """
-        Writes the Python data string to a file
+        Writes the emitted Python source of each submodule to a file
+        """
+
+        if self.__array_data is not None:
+            self.__write_arrays_file()
+        # The helper modules are published before the modules that import them
+        for submodule, emitter in sorted(self.__submodules.items(), key=lambda item: item[0] != '_arrays'):
+            self.__write_submodule(submodule + '.py', emitter)
+
+    def __write_arrays_file(self):
+
+        """
+        Writes the sidecar file holding the stored lists
         """
 
-        config_file_path = path.join(self.__output_path, 'config.py')
+        arrays_file_path = self.__stage_file('_arrays.bin', self.__array_data)
+        if arrays_file_path is None:
+            return
         try:
-            with open(config_file_path, 'w+') as output_file:
+            with open(arrays_file_path, 'wb') as arrays_file:
+                self.__array_data.write_to(arrays_file)
+        except IOError as e:
+            self.__fail(OutputError, 'An error occurred while writing the array file for the Python configuration module', e)
+
+    def __write_submodule(self, file_name, emitter):
+
+        """
+        Writes the emitted Python source of a single submodule to a file
+        """
+
+        config_file_path = self.__stage_file(file_name, emitter)
+        if config_file_path is None:
+            return
+        try:
+            with open(config_file_path, 'w') as output_file:
                 try:
-                    output_file.write(self.__data_string)
+                    emitter.write_to(output_file)
                 except Exception as e_1:
-                    if self.__verbose:
-                        if not self.__silent:
-                            pt.error(e_1)
-                    if not self.__silent:
-                        pt.warn('An error occurred while writing to the Python configuration file')
-                    exit()
+                    self.__fail(OutputError, 'An error occurred while writing to the Python configuration file', e_1)
         except IOError as e_2:
-            if self.__verbose:
-                if not self.__silent:
-                    pt.error(e_2)
-            if not self.__silent:
-                pt.warn('An error occurred while creating the Python configuration file')
-            exit()
+            self.__fail(OutputError, 'An error occurred while creating the Python configuration file', e_2)
 
 
 if __name__ == "__main__":
@@ -18,7 +18,7 @@ classifiers = (
 install_requires = ['PrintTags', 'pyyaml', 'filelock']
 entry_points = {"console_scripts": ['conplex = conplex.conplex:main']}
 zip_safe = False
-packages = ['conplex', 'conplex.api', 'conplex.cli', 'conplex.core']
+packages = ['conplex', 'conplex.api', 'conplex.bench', 'conplex.cli', 'conplex.core']
 
 setup(name=name,
       description=description,
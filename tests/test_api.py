@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+Checks that converting YAML in memory with conplex.api gives the same module
+as converting it to disk: generate_sources must return the files the
+converter writes, and load_module must return a module with the same names
+and values as the imported on-disk module.
+"""
+
+from importlib import import_module, invalidate_caches
+from os import path, listdir
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+import inspect
+import sys
+import unittest
+
+from conplex.api import generate_sources, load_module
+from conplex.core import YAMLConverter, YAMLParseError
+
+FIXTURE_PATH = path.join(path.dirname(__file__), 'data', 'api.yaml')
+
+CASES = {
+    'plain': {},
+    'deduplicate': {'deduplicate': True},
+    'flatten': {'flatten': True},
+    'arrays': {'arrays': 8},
+    'arrays_copied': {'arrays': 8, 'array_type': 'array'}
+}
+
+
+def snapshot(value):
+
+    """
+    Returns the names and values of a module or class as plain data, so that
+    two modules can be compared
+    """
+
+    if inspect.ismodule(value) or inspect.isclass(value):
+        names = getattr(value, '__all__', None) or [name for name in vars(value) if not name.startswith('__')]
+        return {name: snapshot(getattr(value, name)) for name in names}
+    if isinstance(value, memoryview):
+        return ('memoryview', value.format, value.tolist())
+    if type(value).__name__ == 'array':
+        return ('array', value.typecode, value.tolist())
+    return value
+
+
+class APITest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = TemporaryDirectory()
+        self.directory = self.__temp_dir.name
+        sys.path.insert(0, self.directory)
+
+    def tearDown(self):
+        sys.path.remove(self.directory)
+        for name in [name for name in sys.modules if name.startswith('api_')]:
+            del sys.modules[name]
+        self.__temp_dir.cleanup()
+
+    def convert(self, case):
+
+        """
+        Converts the fixture to disk and returns the module name and the directory of the generated module
+        """
+
+        module_name = 'api_' + case
+        yaml_path = path.join(self.directory, module_name + '.yaml')
+        copyfile(FIXTURE_PATH, yaml_path)
+        YAMLConverter(yaml_path, output_dir=path.join(self.directory, ''), module_name=module_name, silent=True, raise_errors=True, **CASES[case])()
+        return module_name, path.join(self.directory, module_name)
+
+    def test_generate_sources(self):
+        for case, options in CASES.items():
+            with self.subTest(case=case):
+                module_name, module_dir = self.convert(case)
+                with open(FIXTURE_PATH, 'rb') as yaml_file:
+                    files = generate_sources(yaml_file, module_name=module_name, base_dir=self.directory, **options)
+                self.assertEqual(sorted(files), sorted(listdir(module_dir)))
+                for file_name, content in files.items():
+                    with open(path.join(module_dir, file_name), 'rb') as written_file:
+                        written = written_file.read()
+                    self.assertEqual(content if isinstance(content, bytes) else content.encode('utf-8'), written, file_name)
+
+    def test_load_module(self):
+        for case, options in CASES.items():
+            with self.subTest(case=case):
+                module_name, _ = self.convert(case)
+                invalidate_caches()
+                on_disk = import_module(module_name)
+                with open(FIXTURE_PATH, encoding='utf-8') as yaml_file:
+                    in_memory = load_module(yaml_file, module_name=module_name, base_dir=self.directory, **options)
+                self.assertNotIn(in_memory, sys.modules.values())
+                self.assertEqual(on_disk.__all__, in_memory.__all__)
+                self.assertEqual(snapshot(on_disk), snapshot(in_memory))
+                self.assertEqual(in_memory.quoted, 'it\'s a "string"')
+
+    def test_not_a_mapping(self):
+        for source in ('', '# only a comment', '{}', '[1, 2]', '42'):
+            with self.subTest(source=source):
+                with self.assertRaises(YAMLParseError):
+                    load_module(source, base_dir=self.directory)
+
+    def test_split_is_rejected(self):
+        with self.assertRaises(ValueError):
+            load_module('key: value', split=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
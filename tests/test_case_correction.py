@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""
+Checks that the precompiled and memoized case correction produces the same
+names as the original implementation, for every key of the corpus in
+data/case_keys.json. Keys the original implementation fails on must fail
+with the same exception.
+"""
+
+from os import path
+from re import sub, findall, compile, IGNORECASE
+import json
+import unittest
+
+from conplex.core import utils
+
+CORPUS_PATH = path.join(path.dirname(__file__), 'data', 'case_keys.json')
+
+
+# The implementations below are copied from ConPlex before case correction was precompiled and memoized
+
+def original_find_acronyms(x):
+    return findall(r'\b[A-Z]*[A-Z]\b\.?', x)
+
+
+def original_upper_camel_case(x):
+
+    acronyms = original_find_acronyms(x)
+    x = sub(r'\s+', '_', x)
+    x = x.replace('_', ' ')
+    x = [word[0].capitalize() + word[1:] for word in x.split(' ')]
+    x = ' '.join(x)
+    x = x.replace(' ', '')
+    for acronym in acronyms:
+        pattern = compile(acronym, IGNORECASE)
+        x = pattern.sub(acronym, x)
+    return x
+
+
+def original_snake_case(x):
+
+    x = sub(r'\s+', '_', x)
+    out = ''
+    for i, char in enumerate(x):
+        if char.isupper():
+            next_char = x[i + 1]
+            previous_char = x[i - 1]
+            if not i == 0:
+                if previous_char.islower():
+                    out += '_'
+                    if next_char.islower() or next_char == '_':
+                        out += char.lower()
+                        continue
+                elif previous_char == '_':
+                    if next_char.islower() or next_char == '_':
+                        out += char.lower()
+                        continue
+            elif next_char.isupper():
+                out += char
+                continue
+            else:
+                out += char.lower()
+                continue
+        elif not char == '_' and x[i - 1].isupper() and x[i - 2].isupper():
+            out += '_'
+        elif char == '_' and x[i - 1] == '_':
+            continue
+        out += char
+
+    if out.endswith('_'):
+        out = out[:len(out) - 1]
+    return out
+
+
+def original_name(key, is_class, case_correction):
+
+    # The per key translation YAMLConverter did before translate_keys
+    name = key.replace('!dict', '')
+    if not case_correction:
+        return name.replace(' ', '_')
+    if is_class:
+        return original_upper_camel_case(name)
+    return original_snake_case(name)
+
+
+def outcome(function, *args):
+
+    """
+    Returns the result of a call, or the type of the exception it raised
+    """
+
+    try:
+        return function(*args)
+    except Exception as e:
+        return type(e)
+
+
+class CaseCorrectionTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(CORPUS_PATH, encoding='utf-8') as corpus_file:
+            cls.keys = json.load(corpus_file)
+
+    def setUp(self):
+        utils.upper_camel_case.cache_clear()
+        utils.snake_case.cache_clear()
+
+    def check(self, original, function):
+        for _ in range(2):  # The second pass is answered from the caches
+            for key in self.keys:
+                self.assertEqual(outcome(original, key), outcome(function, key), key)
+
+    def test_corpus_covers_failures(self):
+        self.assertIs(outcome(original_snake_case, 'trailing A'), IndexError)
+        self.assertIn(IndexError, [outcome(original_snake_case, key) for key in self.keys])
+        self.assertIn(IndexError, [outcome(original_upper_camel_case, key) for key in self.keys])
+
+    def test_upper_camel_case(self):
+        self.check(original_upper_camel_case, utils.upper_camel_case)
+
+    def test_snake_case(self):
+        self.check(original_snake_case, utils.snake_case)
+
+    def test_translate_keys(self):
+        for case_correction in (False, True):
+            for is_class in (False, True):
+                value = {'child': 1} if is_class else 1
+                for key in self.keys:
+                    expected = outcome(original_name, key, is_class and '!dict' not in key, case_correction)
+                    self.assertEqual(expected, outcome(lambda: utils.translate_keys({key: value}, case_correction)[key]), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""
+Checks that run() passes its options on to streams and directory trees, or
+rejects the ones they can not use.
+"""
+
+from os import path, makedirs
+from tempfile import TemporaryDirectory
+import unittest
+
+from conplex.conplex import run
+
+
+class RunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = TemporaryDirectory()
+        self.directory = self.__temp_dir.name
+        self.source_dir = path.join(self.directory, 'source')
+        self.output_dir = path.join(self.directory, 'output')
+        self.yaml_path = self.write(path.join(self.directory, 'stream.yaml'), 'a: 1\n---\na: 2\n')
+        self.overlay_path = self.write(path.join(self.directory, 'overlay.yaml'), 'a: 3\n')
+        makedirs(self.source_dir)
+        self.write(path.join(self.source_dir, 'service.yaml'), 'a: 1\n')
+
+    def tearDown(self):
+        self.__temp_dir.cleanup()
+
+    @staticmethod
+    def write(file_path, content):
+        with open(file_path, 'w') as yaml_file:
+            yaml_file.write(content)
+        return file_path
+
+    def test_overlays_are_rejected(self):
+        options = {'overlays': {'overlays': [self.overlay_path]}, 'merge': {'merge': {'a': 'keep'}}}
+        for yaml_path, documents in ((self.yaml_path, True), (self.source_dir, False)):
+            for name, option in options.items():
+                with self.subTest(yaml_path=yaml_path, option=name):
+                    with self.assertRaises(ValueError):
+                        run(yaml_path, output_dir=self.output_dir, documents=documents, silent=True, **option)
+
+    def test_tree_uses_loader(self):
+        results = run(self.source_dir, output_dir=self.output_dir, workers=1, loader='python')
+        self.assertEqual([result['error'] for result in results], [None])
+        results = run(self.source_dir, output_dir=path.join(self.directory, 'other'), workers=1, loader='unknown')
+        self.assertIn('Unknown YAML loader backend', results[0]['error'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""
+Checks how YAMLConverter handles inputs that its options can not convert.
+"""
+
+from importlib import import_module, invalidate_caches
+from os import path
+from tempfile import TemporaryDirectory
+import sys
+import unittest
+
+from conplex.core import YAMLConverter, ConversionError
+
+
+class YAMLConverterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = TemporaryDirectory()
+        self.directory = self.__temp_dir.name
+
+    def tearDown(self):
+        for name in [name for name in sys.modules if name == 'generated' or name.startswith('generated.')]:
+            del sys.modules[name]
+        self.__temp_dir.cleanup()
+
+    def write(self, file_name, content):
+        file_path = path.join(self.directory, file_name)
+        with open(file_path, 'w') as yaml_file:
+            yaml_file.write(content)
+        return file_path
+
+    def convert(self, yaml_path, **options):
+        converter = YAMLConverter(yaml_path, output_dir=path.join(self.directory, ''), module_name='generated', silent=True, raise_errors=True, **options)
+        return converter()
+
+    def test_empty_mapping(self):
+        yaml_path = self.write('config.yaml', '{}\n')
+        for split in (False, True):
+            with self.subTest(split=split):
+                self.assertEqual(self.convert(yaml_path, split=split), (0, 0))
+                with open(path.join(self.directory, 'generated', '__init__.py')) as init_file:
+                    compile(init_file.read(), '__init__.py', 'exec')
+
+    def test_emit_errors_are_typed(self):
+        cases = {
+            'trailing capital': ('key A: 1\n', {'case_correction': True}),
+            'non-string key': ('1: one\n', {})
+        }
+        for case, (content, options) in cases.items():
+            with self.subTest(case=case):
+                yaml_path = self.write('config.yaml', content)
+                with self.assertRaises(ConversionError):
+                    self.convert(yaml_path, **options)
+
+    def test_index_is_imported_lazily(self):
+        yaml_path = self.write('config.yaml', 'numbers:\n  values: [1, 2, 3, 4, 5, 6, 7, 8]\n  size: 8\n')
+        self.convert(yaml_path, index=True, arrays=4)
+        sys.path.insert(0, self.directory)
+        try:
+            invalidate_caches()
+            module = import_module('generated')
+        finally:
+            sys.path.remove(self.directory)
+        self.assertNotIn('generated._index', sys.modules)
+        self.assertNotIsInstance(vars(module.numbers)['values'], memoryview)
+        self.assertEqual(module.get('numbers.size'), 8)
+        self.assertEqual(module.get('numbers.values').tolist(), list(range(1, 9)))
+        self.assertIn('generated._index', sys.modules)
+
+    def test_split_index_collision(self):
+        yaml_path = self.write('config.yaml', 'index:\n  size: 1\nother: 2\n')
+        with self.assertRaises(ConversionError):
+            self.convert(yaml_path, split=True, index=True)
+        self.assertFalse(path.exists(path.join(self.directory, 'generated', '__init__.py')))
+
+    def test_split_provenance_collision(self):
+        yaml_path = self.write('config.yaml', 'provenance:\n  source: base\n')
+        overlay_path = self.write('overlay.yaml', 'provenance:\n  source: overlay\n')
+        with self.assertRaises(ConversionError):
+            self.convert(yaml_path, split=True, overlays=[overlay_path])
+
+
+if __name__ == "__main__":
+    unittest.main()